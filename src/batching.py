@@ -0,0 +1,149 @@
+"""抽取请求的异步合并队列"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from .extractors.registry import ExtractorRegistry
+from .models.base import BaseExtractionModel
+
+logger = logging.getLogger(__name__)
+
+# 队列元素：(OCR文本, 抽取类型, 等待结果的Future)
+_Request = Tuple[str, str, "asyncio.Future[List[BaseExtractionModel]]"]
+
+
+class AsyncBatchQueue:
+    """把同时到达的抽取请求合并成批次
+
+    后台任务取出第一个请求后，收集已经在队列中的请求（至多 max_batch_size 个），
+    按抽取类型分组后交给 registry.aextract_batch，同一批次的文本打包进一次LLM调用，
+    结果通过各请求的 Future 返回。队列为空时立即发出，不额外等待；
+    max_wait_time 大于0时，从第一个请求起最多再等待这么久以凑满批次。
+    批次在独立任务中处理，等待LLM响应时不影响下一批的收集。
+    """
+
+    def __init__(
+        self,
+        registry: ExtractorRegistry,
+        max_batch_size: int = 16,
+        max_wait_time: float = 0.0,
+    ):
+        """
+        Args:
+            registry: 抽取器注册表
+            max_batch_size: 单个批次最多包含的请求数
+            max_wait_time: 收集一个批次的最长等待时间（秒），0表示不等待
+        """
+        self.registry = registry
+        self.max_batch_size = max_batch_size
+        self.max_wait_time = max_wait_time
+        self._queue: "asyncio.Queue[_Request]" = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._batches: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """启动后台收集任务"""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台任务，等待处理中的批次完成，队列中剩余的请求以错误结束"""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+        while not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("批处理队列已停止"))
+
+    async def add_request(self, text: str, extraction_type: str) -> List[BaseExtractionModel]:
+        """提交一个抽取请求并等待结果
+
+        队列未启动时直接调用注册表抽取。
+        """
+        if self._worker is None:
+            return await self.registry.aextract(text, extraction_type)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, extraction_type, future))
+        return await future
+
+    async def _run(self) -> None:
+        """不断收集批次并在独立任务中处理"""
+        while True:
+            batch = await self._collect_batch()
+            task = asyncio.create_task(self._process_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _collect_batch(self) -> List[_Request]:
+        """等待第一个请求，然后收集已到达的请求"""
+        batch: List[_Request] = []
+        try:
+            batch.append(await self._queue.get())
+            # 让同一轮事件循环中就绪的请求先入队
+            await asyncio.sleep(0)
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.max_wait_time
+
+            while len(batch) < self.max_batch_size:
+                # 已经在队列中的请求直接取出，不再等待
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # 已从队列取出但尚未处理的请求以错误结束，避免调用方一直等待
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("批处理队列已停止"))
+            raise
+
+        return batch
+
+    async def _process_batch(self, batch: List[_Request]) -> None:
+        """按抽取类型分组并发处理一个批次"""
+        groups: Dict[str, List[_Request]] = defaultdict(list)
+        for request in batch:
+            groups[request[1]].append(request)
+
+        await asyncio.gather(*(
+            self._process_group(extraction_type, requests)
+            for extraction_type, requests in groups.items()
+        ))
+
+    async def _process_group(self, extraction_type: str, requests: List[_Request]) -> None:
+        """处理同一抽取类型的一组请求，把结果或异常分发给各自的 Future"""
+        try:
+            results = await self.registry.aextract_batch(
+                [text for text, _, _ in requests],
+                extraction_type
+            )
+        except Exception as e:
+            logger.exception("批量抽取错误: %s", extraction_type)
+            for _, _, future in requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # 客户端断开时 Future 可能已被取消
+        for (_, _, future), items in zip(requests, results):
+            if not future.done():
+                future.set_result(items)
@@ -1,8 +1,9 @@
 """配置模块
 
-管理系统配置和自动注册。
+管理系统配置、日志和自动注册。
 """
 
 from .setup import setup_default_extractors
+from .log import setup_logging
 
-__all__ = ["setup_default_extractors"]
+__all__ = ["setup_default_extractors", "setup_logging"]
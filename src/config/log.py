@@ -0,0 +1,39 @@
+"""日志配置"""
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: Optional[str] = None) -> None:
+    """为根日志记录器配置非阻塞输出
+
+    日志记录经 QueueHandler 放入队列，由后台 QueueListener 线程写到标准错误，
+    调用方（例如事件循环）不会因为写日志而阻塞。重复调用不会重复配置。
+
+    Args:
+        level: 日志级别，默认读取环境变量 LOG_LEVEL（未设置时为 INFO）
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
+
+    _listener.start()
+    atexit.register(_listener.stop)
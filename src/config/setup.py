@@ -1,26 +1,47 @@
 """系统设置和默认配置"""
 
+import logging
+from typing import Optional
+
+import httpx
+
 from ..models import Person, Sentiment, CompanyInfo, ProductInfo, ContactInfo
 from ..extractors import LangChainExtractor
+from ..extractors.langchain_extractor import list_model_for
 from ..extractors.registry import registry
 
+logger = logging.getLogger(__name__)
+
+# 上一次注册的默认抽取器；它绑定的HTTP客户端随应用生命周期关闭，
+# 同一进程中再次初始化应用时用新的抽取器替换它
+_default_extractor: Optional[LangChainExtractor] = None
 
-def setup_default_extractors():
+
+def setup_default_extractors(http_async_client: Optional[httpx.AsyncClient] = None):
     """设置默认的抽取器和模型
     
     这个函数会注册所有内置的模型类型和抽取器。
     用户可以通过类似的方式注册自定义的模型和抽取器。
+    重复调用时替换上一次注册的默认抽取器，不会重复注册。
+
+    Args:
+        http_async_client: LLM异步请求使用的HTTP客户端，通常与OCR客户端共用一个连接池
     """
     
     # 注册内置模型类型
-    registry.register_model(Person)
-    registry.register_model(Sentiment)
-    registry.register_model(CompanyInfo)
-    registry.register_model(ProductInfo)
-    registry.register_model(ContactInfo)
+    builtin_models = [Person, Sentiment, CompanyInfo, ProductInfo, ContactInfo]
+    for model_class in builtin_models:
+        registry.register_model(model_class)
+        # 预先创建结构化输出模型，首个请求不再承担这部分开销
+        list_model_for(model_class)
     
     # 注册默认抽取器
-    langchain_extractor = LangChainExtractor()
-    registry.register_extractor(langchain_extractor)
+    global _default_extractor
+    langchain_extractor = LangChainExtractor(http_async_client=http_async_client)
+    if _default_extractor is None:
+        registry.register_extractor(langchain_extractor)
+    else:
+        registry.replace_extractor(_default_extractor, langchain_extractor)
+    _default_extractor = langchain_extractor
     
-    print("默认抽取器和模型已设置完成")
+    logger.info("默认抽取器和模型已设置完成")
@@ -4,14 +4,17 @@
 - 基础抽取器接口
 - LangChain抽取器实现
 - 具体类型的抽取器
+- 批量打包工具
 """
 
 from .base import BaseExtractor
 from .langchain_extractor import LangChainExtractor
 from .registry import ExtractorRegistry
+from .batching import ChunkBatcher
 
 __all__ = [
     "BaseExtractor",
     "LangChainExtractor", 
-    "ExtractorRegistry"
+    "ExtractorRegistry",
+    "ChunkBatcher"
 ]
@@ -1,5 +1,6 @@
 """基础抽取器接口"""
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Type
 from ..models.base import BaseExtractionModel
@@ -40,3 +41,84 @@ class BaseExtractor(ABC):
             是否支持该模型
         """
         pass
+
+    def extract_batch(
+        self,
+        texts: List[str],
+        model_class: Type[BaseExtractionModel]
+    ) -> List[List[BaseExtractionModel]]:
+        """批量抽取信息
+
+        默认实现逐条调用 extract，子类可以重写以合并请求。
+
+        Args:
+            texts: 要抽取的文本列表
+            model_class: 抽取模型类
+
+        Returns:
+            与texts一一对应的抽取结果列表
+        """
+        return [self.extract(text, model_class) for text in texts]
+
+    async def aextract(
+        self,
+        text: str,
+        model_class: Type[BaseExtractionModel]
+    ) -> List[BaseExtractionModel]:
+        """异步抽取信息
+
+        默认实现在线程中运行 extract，避免阻塞事件循环。
+        """
+        return await asyncio.to_thread(self.extract, text, model_class)
+
+    async def aextract_batch(
+        self,
+        texts: List[str],
+        model_class: Type[BaseExtractionModel]
+    ) -> List[List[BaseExtractionModel]]:
+        """异步批量抽取信息
+
+        默认实现在线程中运行 extract_batch，子类可以重写以合并请求。
+        """
+        return await asyncio.to_thread(self.extract_batch, texts, model_class)
+
+    async def aextract_many(
+        self,
+        texts: List[str],
+        model_class: Type[BaseExtractionModel],
+        max_concurrency: int = 8
+    ) -> List[List[BaseExtractionModel]]:
+        """并发抽取多段文本
+
+        Args:
+            texts: 要抽取的文本列表
+            model_class: 抽取模型类
+            max_concurrency: 同时进行的抽取数上限
+
+        Returns:
+            与texts一一对应的抽取结果列表
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(text: str) -> List[BaseExtractionModel]:
+            async with semaphore:
+                return await self.aextract(text, model_class)
+
+        return list(await asyncio.gather(*(run(text) for text in texts)))
+
+    async def awarmup(
+        self,
+        model_classes: List[Type[BaseExtractionModel]],
+        invoke: bool = False,
+        timeout: float = 10.0
+    ) -> None:
+        """预热抽取器
+
+        在服务启动时调用，提前完成客户端创建等一次性开销。默认实现不做任何事。
+
+        Args:
+            model_classes: 由该抽取器负责的模型类
+            invoke: 是否发出一次真实请求以建立连接
+            timeout: 预热请求的超时时间（秒）
+        """
+        pass
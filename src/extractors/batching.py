@@ -0,0 +1,69 @@
+"""文本分批工具"""
+
+from typing import List, Sequence
+
+
+class ChunkBatcher:
+    """按token预算贪心地将多段文本打包成批次
+
+    token数按 len(text) // 4 粗略估算。每个批次可用的预算为
+    max_tokens 减去系统提示和响应预留的token数；单段超出预算的文本独占一个批次。
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 8192,
+        system_prompt_tokens: int = 0,
+        response_buffer_tokens: int = 2048,
+        max_batch_size: int = 16,
+        separator_tokens: int = 8,
+    ):
+        """
+        Args:
+            max_tokens: 模型上下文窗口大小
+            system_prompt_tokens: 系统提示占用的token数
+            response_buffer_tokens: 为模型输出预留的token数
+            max_batch_size: 单个批次最多包含的文本数
+            separator_tokens: 每段文本的分隔标记占用的token数
+        """
+        self.max_tokens = max_tokens
+        self.system_prompt_tokens = system_prompt_tokens
+        self.response_buffer_tokens = response_buffer_tokens
+        self.max_batch_size = max_batch_size
+        self.separator_tokens = separator_tokens
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """粗略估算文本的token数"""
+        return len(text) // 4
+
+    @property
+    def budget(self) -> int:
+        """单个批次可用于文本内容的token预算"""
+        return max(0, self.max_tokens - self.system_prompt_tokens - self.response_buffer_tokens)
+
+    def batch(self, texts: Sequence[str]) -> List[List[int]]:
+        """将文本分组
+
+        Args:
+            texts: 待分组的文本
+
+        Returns:
+            批次列表，每个批次是texts中的下标列表，保持原有顺序
+        """
+        batches: List[List[int]] = []
+        current: List[int] = []
+        used = 0
+
+        for index, text in enumerate(texts):
+            cost = self.estimate_tokens(text) + self.separator_tokens
+            if current and (used + cost > self.budget or len(current) >= self.max_batch_size):
+                batches.append(current)
+                current = []
+                used = 0
+            current.append(index)
+            used += cost
+
+        if current:
+            batches.append(current)
+        return batches
@@ -0,0 +1,453 @@
+"""抽取结果缓存"""
+
+import hashlib
+import json
+import logging
+import math
+import operator
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, BinaryIO, Callable, Dict, Hashable, List, Optional, Protocol, Sequence, Tuple, Type
+
+from ..models.base import BaseExtractionModel
+
+try:
+    import numpy
+except ImportError:  # 可选依赖
+    numpy = None
+
+try:
+    import blake3
+except ImportError:  # 可选依赖
+    blake3 = None
+
+logger = logging.getLogger(__name__)
+
+# 内容摘要算法：安装了 blake3 时使用 BLAKE3（SIMD并行，远快于SHA-256），否则使用 SHA-256。
+# 算法名写在摘要前面，切换算法后新旧缓存键不会混淆
+HASH_ALGORITHM = "blake3" if blake3 is not None else "sha256"
+
+# 超过该大小的内容用多线程计算BLAKE3
+_BLAKE3_THREADED_SIZE = 1024 * 1024
+
+
+def content_digest(data: bytes) -> str:
+    """计算内容摘要
+
+    Returns:
+        "算法:十六进制摘要"，例如 "blake3:af13..."
+    """
+    if blake3 is not None:
+        max_threads = blake3.blake3.AUTO if len(data) >= _BLAKE3_THREADED_SIZE else 1
+        digest = blake3.blake3(data, max_threads=max_threads).hexdigest()
+    else:
+        digest = hashlib.sha256(data).hexdigest()
+    return f"{HASH_ALGORITHM}:{digest}"
+
+
+def file_digest(file: BinaryIO) -> str:
+    """分块计算已打开文件的摘要，格式同 content_digest，计算后文件指针回到开头"""
+    if blake3 is not None:
+        hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        while chunk := file.read(_BLAKE3_THREADED_SIZE):
+            hasher.update(chunk)
+    elif hasattr(hashlib, "file_digest"):  # Python 3.11+
+        hasher = hashlib.file_digest(file, "sha256")
+    else:
+        hasher = hashlib.sha256()
+        while chunk := file.read(_BLAKE3_THREADED_SIZE):
+            hasher.update(chunk)
+    file.seek(0)
+    return f"{HASH_ALGORITHM}:{hasher.hexdigest()}"
+
+
+class LRUCache:
+    """线程安全的LRU缓存"""
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Args:
+            maxsize: 最多保存的条目数
+        """
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """读取缓存，命中时将条目移到最近使用的位置"""
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """删除并返回条目"""
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend(Protocol):
+    """缓存后端接口，键和值都是字符串"""
+
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    def set(self, key: str, value: str, ttl_seconds: Optional[int] = None) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+class InMemoryBackend:
+    """进程内LRU缓存后端，条目按TTL过期"""
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Args:
+            maxsize: 最多保存的条目数
+        """
+        self._cache = LRUCache(maxsize)
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._cache.pop(key)
+            return None
+        return value
+
+    def set(self, key: str, value: str, ttl_seconds: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + ttl_seconds if ttl_seconds else None
+        self._cache.set(key, (value, expires_at))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class RedisBackend:
+    """Redis缓存后端，多个worker进程共享同一份缓存
+
+    需要安装 redis 包。
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "ocr-extractor:"):
+        """
+        Args:
+            url: Redis连接地址
+            prefix: 键前缀，clear 只删除带该前缀的键
+        """
+        import redis  # 可选依赖
+
+        self._client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(self.prefix + key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, key: str, value: str, ttl_seconds: Optional[int] = None) -> None:
+        self._client.set(self.prefix + key, value, ex=ttl_seconds or None)
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=self.prefix + "*"):
+            self._client.delete(key)
+
+
+class LLMCache:
+    """LLM抽取结果的精确匹配缓存
+
+    键为请求参数（模型、抽取类型、提示、文本）排序后JSON的内容摘要，
+    值为调用方序列化好的抽取结果JSON。后端读写出错时按未命中处理，不影响抽取。
+    """
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: Optional[int] = 3600):
+        """
+        Args:
+            backend: 缓存后端
+            ttl_seconds: 条目有效期（秒），None表示不过期
+        """
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def cache_key(payload: Dict[str, Any]) -> str:
+        """计算请求参数的缓存键"""
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return content_digest(raw.encode("utf-8"))
+
+    def get(self, key: str) -> Optional[str]:
+        """读取缓存的抽取结果JSON"""
+        try:
+            return self.backend.get(key)
+        except Exception:
+            logger.warning("读取LLM缓存失败", exc_info=True)
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """写入抽取结果JSON"""
+        try:
+            self.backend.set(key, value, self.ttl_seconds)
+        except Exception:
+            logger.warning("写入LLM缓存失败", exc_info=True)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self.backend.clear()
+
+
+class SemanticCache:
+    """按文本向量相似度匹配的近似缓存
+
+    文本经 embed 函数编码并归一化后，在同一命名空间内做暴力内积搜索
+    （与 FAISS 的 IndexFlatIP 相同），余弦相似度不低于阈值即视为命中。
+    每个命名空间最多保存 maxsize 条，写满后覆盖最早的条目。
+    安装了 numpy 时用矩阵乘法计算相似度，否则逐条计算。
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], Sequence[float]],
+        threshold: float = 0.92,
+        maxsize: int = 1024,
+    ):
+        """
+        Args:
+            embed: 文本编码函数
+            threshold: 命中所需的最低余弦相似度
+            maxsize: 每个命名空间最多保存的条目数
+        """
+        self.embed = embed
+        self.threshold = threshold
+        self.maxsize = maxsize
+        # 命名空间 -> [向量列表, 值列表, 下一个写入位置]
+        self._indexes: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def encode(self, text: str) -> Any:
+        """把文本编码为单位向量"""
+        if numpy is not None:
+            vector = numpy.asarray(self.embed(text), dtype=numpy.float32)
+            norm = float(numpy.linalg.norm(vector))
+        else:
+            vector = [float(x) for x in self.embed(text)]
+            norm = math.sqrt(sum(x * x for x in vector))
+        if not norm:
+            return vector
+        return vector / norm if numpy is not None else [x / norm for x in vector]
+
+    def get(self, namespace: str, vector: Any) -> Any:
+        """查找最相似的条目，相似度不足时返回None"""
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None:
+                return None
+            vectors, values, _ = index
+            if numpy is not None:
+                scores = numpy.stack(vectors) @ vector
+                best = int(scores.argmax())
+                score = float(scores[best])
+            else:
+                score, best = max(
+                    (sum(map(operator.mul, stored, vector)), i) for i, stored in enumerate(vectors)
+                )
+            if score >= self.threshold:
+                return values[best]
+        return None
+
+    def add(self, namespace: str, vector: Any, value: Any) -> None:
+        """写入条目"""
+        with self._lock:
+            index = self._indexes.setdefault(namespace, [[], [], 0])
+            vectors, values, position = index
+            if len(vectors) < self.maxsize:
+                vectors.append(vector)
+                values.append(value)
+            else:
+                vectors[position] = vector
+                values[position] = value
+            index[2] = (position + 1) % self.maxsize
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._indexes.clear()
+
+
+def sentence_transformer_embedder(model_name: str) -> Callable[[str], Sequence[float]]:
+    """创建基于 sentence-transformers 本地模型的编码函数
+
+    模型在第一次编码时加载。需要安装 sentence-transformers。
+    """
+    model = None
+    lock = threading.Lock()
+
+    def embed(text: str) -> Sequence[float]:
+        nonlocal model
+        if model is None:
+            with lock:
+                if model is None:
+                    from sentence_transformers import SentenceTransformer  # 可选依赖
+                    model = SentenceTransformer(model_name)
+        return model.encode(text, normalize_embeddings=True)
+
+    return embed
+
+
+# 结构化键的归一化规则：按顺序把可变内容替换成占位符
+# (正则, 占位符, 行中必须包含的字符)；邮箱规则只在含@的行上运行，
+# 本地部分只从字符串头部或非邮箱字符之后开始匹配，避免在长单词上逐位置重试
+_STRUCTURE_RULES = (
+    (re.compile(r'(?<![\w.+-])[\w.+-]+@[\w-]+(?:\.[\w-]+)+'), "<EMAIL>", "@"),
+    (re.compile(r'\+?\d[\d\-\s()]{6,}\d'), "<PHONE>", None),
+    (re.compile(r'\d+'), "#", None),
+    (re.compile(r'\b[A-Z][a-z]+\b'), "<NAME>", None),
+)
+
+# 槽位：(字段名, 行号, 前缀, 后缀)
+_Slot = Tuple[str, int, str, str]
+
+
+def _split_lines(text: str) -> List[str]:
+    return [s for line in text.splitlines() if (s := line.strip())]
+
+
+def structural_key(text: str) -> str:
+    """计算文本的结构键
+
+    邮箱、电话、数字和首字母大写的单词会被替换为占位符，
+    因此版式相同、只有姓名号码等不同的文本得到相同的键。
+    """
+    normalized = []
+    for line in _split_lines(text):
+        for pattern, placeholder, required in _STRUCTURE_RULES:
+            if required is None or required in line:
+                line = pattern.sub(placeholder, line)
+        normalized.append(line)
+    return "\n".join(normalized)
+
+
+class StructuralCache:
+    """按文本结构缓存抽取结果
+
+    写入时记录每个字段取自原文的哪一行（以及该行中字段值前后的固定文本），
+    命中时从新文本的对应位置重新取值，从而复用版式相同的文本的抽取结果。
+    只有所有字段都能在原文中定位的结果才会被缓存。
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Args:
+            maxsize: 最多保存的结构数
+        """
+        self._cache = LRUCache(maxsize)
+
+    @staticmethod
+    def _key(text: str, model_class: Type[BaseExtractionModel]) -> str:
+        raw = f"{model_class.__name__}\n{structural_key(text)}"
+        return content_digest(raw.encode("utf-8"))
+
+    def get(
+        self,
+        text: str,
+        model_class: Type[BaseExtractionModel]
+    ) -> Optional[List[BaseExtractionModel]]:
+        """查找结构相同的缓存结果，并用新文本重新填充字段
+
+        Returns:
+            抽取结果列表；未命中或无法重新填充时返回None
+        """
+        templates = self._cache.get(self._key(text, model_class))
+        if templates is None:
+            return None
+
+        lines = _split_lines(text)
+        items = []
+        for slots in templates:
+            values: Dict[str, str] = {}
+            for field_name, line_index, prefix, suffix in slots:
+                if line_index >= len(lines):
+                    return None
+                line = lines[line_index]
+                end = len(line) - len(suffix)
+                if end < len(prefix) or not line.startswith(prefix) or not line.endswith(suffix):
+                    return None
+                values[field_name] = line[len(prefix):end]
+            items.append(model_class(**values))
+        return items
+
+    def set(
+        self,
+        text: str,
+        model_class: Type[BaseExtractionModel],
+        items: List[BaseExtractionModel]
+    ) -> bool:
+        """记录抽取结果的字段位置
+
+        Returns:
+            是否写入了缓存
+        """
+        if not items:
+            return False
+
+        lines = _split_lines(text)
+        templates = []
+        for item in items:
+            slots = self._locate(item, lines)
+            if slots is None:
+                return False
+            templates.append(slots)
+
+        self._cache.set(self._key(text, model_class), templates)
+        return True
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @staticmethod
+    def _locate(item: BaseExtractionModel, lines: List[str]) -> Optional[List[_Slot]]:
+        """定位每个字段值在原文中的位置，任一字段无法定位时返回None"""
+        slots: List[_Slot] = []
+        for field_name, field in type(item).model_fields.items():
+            if field_name == "confidence":
+                continue
+            value = getattr(item, field_name)
+            if value == field.default:
+                continue
+            if not isinstance(value, str) or not value:
+                return None
+
+            for line_index, line in enumerate(lines):
+                position = line.find(value)
+                if position >= 0:
+                    slots.append((field_name, line_index, line[:position], line[position + len(value):]))
+                    break
+            else:
+                return None
+        return slots
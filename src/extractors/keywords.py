@@ -0,0 +1,73 @@
+"""多关键词匹配"""
+
+import re
+from typing import List, Sequence
+
+try:
+    import ahocorasick
+except ImportError:  # 可选依赖
+    ahocorasick = None
+
+# 英文关键词按整词匹配，文本中的英文单词由该正则一次切出
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+def _is_word(keyword: str) -> bool:
+    return _WORD_RE.fullmatch(keyword) is not None
+
+
+class KeywordMatcher:
+    """多关键词匹配器
+
+    英文关键词按整词匹配，中文等其他关键词按子串匹配（中文没有空格分词）。
+    安装了 pyahocorasick 时使用 Aho–Corasick 自动机单遍扫描文本；
+    否则对文本做一次英文分词后用集合判断英文关键词，其余关键词逐个做子串查找。
+    关键词统一按小写匹配。
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        """
+        Args:
+            keywords: 关键词列表，重复项会被忽略
+        """
+        self.keywords = tuple(dict.fromkeys(keyword.lower() for keyword in keywords))
+        self._words = frozenset(keyword for keyword in self.keywords if _is_word(keyword))
+        self._automaton = None
+
+        if ahocorasick is not None and self.keywords:
+            automaton = ahocorasick.Automaton()
+            for index, keyword in enumerate(self.keywords):
+                automaton.add_word(keyword, index)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def find(self, text: str) -> List[str]:
+        """查找文本中出现的关键词
+
+        Args:
+            text: 已转为小写的文本
+
+        Returns:
+            出现过的关键词，按关键词定义顺序排列且不重复
+        """
+        if self._automaton is not None:
+            hits = set()
+            for end, index in self._automaton.iter(text):
+                keyword = self.keywords[index]
+                if keyword in self._words and not self._is_whole_word(text, end - len(keyword) + 1, end + 1):
+                    continue
+                hits.add(index)
+            return [self.keywords[index] for index in sorted(hits)]
+
+        tokens = frozenset(_WORD_RE.findall(text)) if self._words else frozenset()
+        return [
+            keyword for keyword in self.keywords
+            if (keyword in tokens if keyword in self._words else keyword in text)
+        ]
+
+    @staticmethod
+    def _is_whole_word(text: str, start: int, end: int) -> bool:
+        """检查 text[start:end] 两侧不是英文字母"""
+        before = text[start - 1] if start > 0 else ""
+        after = text[end] if end < len(text) else ""
+        return not ("a" <= before <= "z") and not ("a" <= after <= "z")
@@ -1,24 +1,179 @@
 """LangChain抽取器实现"""
 
+import asyncio
+import functools
+import logging
 import os
 import re
-from typing import List, Dict, Any, Type
-from pydantic import create_model, Field
-from langchain_core.prompts import ChatPromptTemplate
+import threading
+from itertools import islice
+from typing import List, Dict, Any, NamedTuple, Optional, Type, Tuple
+import httpx
+from pydantic import BaseModel, TypeAdapter, create_model, Field
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import Runnable
 from langchain_openai import ChatOpenAI
 
 from .base import BaseExtractor
+from .batching import ChunkBatcher
+from .cache import (
+    InMemoryBackend,
+    LLMCache,
+    RedisBackend,
+    SemanticCache,
+    StructuralCache,
+    content_digest,
+    sentence_transformer_embedder,
+)
+from .keywords import KeywordMatcher
 from ..models.base import BaseExtractionModel
 from ..models import Person, Sentiment, CompanyInfo, ProductInfo, ContactInfo
 
+logger = logging.getLogger(__name__)
+
+
+# 所有抽取器实例共享的HTTP连接池，首次创建LLM客户端时初始化
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+_http_clients: Optional[Tuple[httpx.Client, httpx.AsyncClient]] = None
+_http_clients_lock = threading.Lock()
+
+
+def _shared_http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """获取共享的同步和异步HTTP客户端"""
+    global _http_clients
+    if _http_clients is None:
+        with _http_clients_lock:
+            if _http_clients is None:
+                _http_clients = (
+                    httpx.Client(limits=_HTTP_LIMITS),
+                    httpx.AsyncClient(limits=_HTTP_LIMITS),
+                )
+    return _http_clients
+
+
+@functools.lru_cache(maxsize=None)
+def list_model_for(model_class: Type[BaseExtractionModel]) -> Type[BaseModel]:
+    """获取包装 List[model_class] 的结构化输出模型
+
+    Pydantic 创建模型类需要构建完整的校验器，每个模型类只创建一次。
+    """
+    return create_model(
+        f"{model_class.__name__}List",
+        items=(List[model_class], Field(description=f"抽取的{model_class.__name__}列表"))
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def list_adapter_for(model_class: Type[BaseExtractionModel]) -> TypeAdapter:
+    """获取 List[model_class] 的 TypeAdapter
+
+    缓存值用它直接在JSON和模型列表之间转换，不经过中间的字典列表。
+    """
+    return TypeAdapter(List[model_class])
+
+
+@functools.lru_cache(maxsize=None)
+def batch_list_model_for(model_class: Type[BaseExtractionModel]) -> Type[BaseModel]:
+    """获取批量模式使用的 List[List[model_class]] 结构化输出模型"""
+    return create_model(
+        f"{model_class.__name__}BatchList",
+        items=(
+            List[List[model_class]],
+            Field(description=f"每个文档对应一个{model_class.__name__}子列表，顺序与文档编号一致")
+        )
+    )
+
+
+# 启发式抽取使用的预编译正则：每行扫描一次，收集命中的分组后按固定优先级分派
+# （公司：后缀 > 电话 > 邮箱；联系人：邮箱 > 电话），与行内出现的先后无关。
+# tel 要求单词边界，避免 Intel、Hotel 之类的词被当作电话标记
+_COMPANY_LINE_RE = re.compile(
+    r'(?P<suffix>inc|corp|llc|ltd|co\b|公司|有限)|(?P<phone_tag>\btel\b|电话|phone)|(?P<email>@)',
+    re.IGNORECASE
+)
+_CONTACT_LINE_RE = re.compile(r'(?P<email>@)|(?P<phone_tag>\btel\b|电话|phone)', re.IGNORECASE)
+_PHONE_RE = re.compile(r'[\d\-\(\)\+\s]{5,}')
+
+# 人员抽取的LLM门槛：文本过短，或既没有职位/公司关键词、也没有像姓名的内容
+# （两个连续的首字母大写单词或两个以上连续汉字）时，直接使用启发式方法
+_PERSON_MIN_TEXT_LENGTH = 8
+_PERSON_SIGNAL_RE = re.compile(
+    r'(?i:\b(?:inc|corp|llc|ltd|director|manager|engineer|analyst|ceo|cto|cfo|founder|president)\b)'
+    r'|\b[A-Z][a-z]+\s+[A-Z][a-z]+'
+    r'|[\u4e00-\u9fff]{2,}'
+)
+
+# 启发式情感分析使用的情感词
+_POSITIVE_WORDS = ("好", "棒", "优秀", "满意", "喜欢", "推荐", "excellent", "good", "great", "awesome")
+_NEGATIVE_WORDS = ("差", "坏", "糟糕", "失望", "不满", "讨厌", "bad", "terrible", "awful", "poor")
+_POSITIVE_SET = frozenset(_POSITIVE_WORDS)
+
+
+def _score_sentiment(keywords: List[str]) -> Tuple[str, float]:
+    """根据命中的情感词计算情感倾向和置信度分数"""
+    positive_count = sum(1 for word in keywords if word in _POSITIVE_SET)
+    negative_count = len(keywords) - positive_count
+
+    if positive_count > negative_count:
+        return "positive", min(0.8, positive_count * 0.2)
+    if negative_count > positive_count:
+        return "negative", min(0.8, negative_count * 0.2)
+    return "neutral", 0.5
+
+
+# 用户消息前缀：固定前缀在前，OCR文本直接拼接在末尾，
+# 使每次请求的 系统提示+指令 前缀逐字节相同，便于服务端命中提示缓存
+_HUMAN_PREFIX = "从以下OCR文本中抽取信息：\n\n"
+_BATCH_HUMAN_PREFIX = "从以下多个OCR文档中分别抽取信息：\n\n"
+
+# 批量模式下附加在系统提示之后的说明
+_BATCH_INSTRUCTION = (
+    "输入包含多个文档，每个文档以 <<<DOC i>>> 标记开头（i 从0开始）。"
+    "请分别处理每个文档，为每个文档返回一个子列表，子列表顺序与文档编号一致；"
+    "某个文档没有可抽取的信息时返回空子列表。"
+)
+
+
+def _pack_documents(texts: List[str]) -> str:
+    """把多段文本按文档编号拼接成一个批量提示"""
+    return "\n\n".join(f"<<<DOC {i}>>>\n{text}" for i, text in enumerate(texts))
+
+
+class _CacheProbe(NamedTuple):
+    """一次缓存查找的上下文，未命中时据此写回结果"""
+    text: str
+    model_class: Type[BaseExtractionModel]
+    key: Optional[str]
+    vector: Any
+
+
+class _Bundle(NamedTuple):
+    """按模型类缓存的 (输出模型, 系统消息, 用户消息前缀, 结构化输出LLM)"""
+    model: Type[BaseModel]
+    system_message: SystemMessage
+    human_prefix: str
+    structured_llm: Runnable
+
+    def messages(self, text: str) -> List[BaseMessage]:
+        """构建一次请求的消息列表
+
+        系统消息对象在所有请求间共用，只新建用户消息，不经过提示模板渲染。
+        """
+        return [self.system_message, HumanMessage(content=self.human_prefix + text)]
+
 
 class LangChainExtractor(BaseExtractor):
     """基于LangChain的通用信息抽取器"""
     
-    def __init__(self):
-        """初始化抽取器"""
+    def __init__(self, http_async_client: Optional[httpx.AsyncClient] = None):
+        """初始化抽取器
+
+        Args:
+            http_async_client: 异步LLM请求使用的HTTP客户端，默认使用模块共享的客户端
+        """
+        self._http_async_client = http_async_client
         
-        # 不同抽取类型的系统提示模板
+        # 不同抽取类型的系统提示（固定文本，不要插入任何随请求变化的内容）
         self.system_prompts = {
             "person": (
                 "你是一个专业的人员信息抽取专家。从OCR文本中抽取人员信息。"
@@ -75,24 +230,105 @@ class LangChainExtractor(BaseExtractor):
             )
         }
         
-        # 初始化LLM
-        self._init_llm()
+        # 情感词匹配器（正面词在前，保持关键词输出顺序）
+        self._sentiment_matcher = KeywordMatcher(_POSITIVE_WORDS + _NEGATIVE_WORDS)
+
+        # 按模型类缓存的消息和结构化输出LLM
+        self._bundle_cache: Dict[type, _Bundle] = {}
+        self._batch_bundle_cache: Dict[type, _Bundle] = {}
+
+        # 精确匹配缓存：相同模型、抽取类型和文本直接返回已有结果，容量为0时关闭；
+        # 配置 LLM_CACHE_REDIS_URL 时多个worker共享Redis缓存
+        cache_size = int(os.getenv("LLM_CACHE_SIZE", "4096"))
+        cache_ttl = int(os.getenv("LLM_CACHE_TTL", "3600"))
+        redis_url = os.getenv("LLM_CACHE_REDIS_URL")
+        if redis_url:
+            self.cache = LLMCache(RedisBackend(redis_url), ttl_seconds=cache_ttl)
+        elif cache_size > 0:
+            self.cache = LLMCache(InMemoryBackend(maxsize=cache_size), ttl_seconds=cache_ttl)
+        else:
+            self.cache = None
+
+        # 语义缓存：配置 sentence-transformers 模型名时开启，近似重复的文本复用已有结果
+        semantic_model = os.getenv("LLM_SEMANTIC_CACHE_MODEL")
+        self.semantic_cache = (
+            SemanticCache(
+                sentence_transformer_embedder(semantic_model),
+                threshold=float(os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD", "0.92")),
+            )
+            if semantic_model else None
+        )
+
+        # Redis往返和语义向量计算（首次使用时还要加载模型）会阻塞，
+        # 配置了它们时异步路径把缓存查找和写回放到线程中执行
+        self._blocking_cache = bool(redis_url) or self.semantic_cache is not None
+
+        # 结构化结果缓存：版式相同的文本复用已有抽取结果，容量为0时关闭
+        structural_cache_size = int(os.getenv("LLM_STRUCTURAL_CACHE_SIZE", "0"))
+        self.structural_cache = (
+            StructuralCache(maxsize=structural_cache_size) if structural_cache_size > 0 else None
+        )
+
+        # 服务端提示缓存：anthropic 在系统提示块上标记 cache_control，
+        # openai 为所有请求带上固定的 prompt_cache_key，留空时不做额外处理
+        self.prompt_cache_mode = os.getenv("LLM_PROMPT_CACHE", "").strip().lower()
+
+        # 因输入信号不足而跳过LLM的次数
+        self.skipped_llm = 0
+
+        # 批量抽取的上下文窗口和输出预留token数
+        self.batch_max_tokens = int(os.getenv("LLM_BATCH_MAX_TOKENS", "8192"))
+        self.batch_response_tokens = int(os.getenv("LLM_BATCH_RESPONSE_TOKENS", "2048"))
+
+        # LLM客户端在首次使用时创建
+        self._llm: Optional[ChatOpenAI] = None
+        self._llm_initialized = False
+        self._llm_lock = threading.Lock()
     
-    def _init_llm(self):
+    @property
+    def llm(self) -> Optional[ChatOpenAI]:
+        """LLM客户端，首次访问时创建；未配置API密钥时为None"""
+        if not self._llm_initialized:
+            with self._llm_lock:
+                if not self._llm_initialized:
+                    self._llm = self._init_llm()
+                    self._llm_initialized = True
+        return self._llm
+
+    @llm.setter
+    def llm(self, value: Optional[ChatOpenAI]) -> None:
+        self._llm = value
+        self._llm_initialized = True
+        self._bundle_cache.clear()
+        self._batch_bundle_cache.clear()
+
+    def _init_llm(self) -> Optional[ChatOpenAI]:
         """初始化LLM"""
         llm_model = os.getenv("LLM_MODEL", "qwen3:4b-instruct-2507-fp16")
         llm_base_url = os.getenv("LLM_BASE_URL", "http://0.0.0.0:11434/v1")
         llm_api_key = os.getenv("LLM_API_KEY", "fake_key")
 
-        if llm_api_key:
-            self.llm = ChatOpenAI(
-                model=llm_model, base_url=llm_base_url, api_key=llm_api_key, temperature=0
-            )
-        else:
-            self.llm = None
+        if not llm_api_key:
+            logger.warning("未找到LLM API密钥。将使用启发式回退方法工作。")
+            return None
 
-        if self.llm is None:
-            print("警告：未找到LLM API密钥。将使用启发式回退方法工作。")
+        # 固定的缓存键让各worker的请求路由到同一份服务端前缀缓存
+        extra_body = None
+        if self.prompt_cache_mode == "openai":
+            extra_body = {"prompt_cache_key": os.getenv("LLM_PROMPT_CACHE_KEY", "ocr-extractor")}
+
+        http_client, http_async_client = _shared_http_clients()
+        if self._http_async_client is not None:
+            http_async_client = self._http_async_client
+        return ChatOpenAI(
+            model=llm_model,
+            base_url=llm_base_url,
+            api_key=llm_api_key,
+            temperature=0,
+            http_client=http_client,
+            http_async_client=http_async_client,
+            extra_body=extra_body,
+        )
     
     def extract(
         self, 
@@ -104,45 +340,439 @@ class LangChainExtractor(BaseExtractor):
             if not text or not text.strip():
                 return []
 
-            extraction_type = model_class.get_extraction_type()
-            
-            # 创建列表模型
-            list_model_name = f"{model_class.__name__}List"
-            list_model = create_model(
-                list_model_name,
-                items=(List[model_class], Field(description=f"抽取的{model_class.__name__}列表"))
-            )
-
-            # 创建提示模板
-            system_prompt = self.system_prompts.get(extraction_type, "")
-            prompt_template = ChatPromptTemplate.from_messages([
-                ("system", system_prompt),
-                ("human", "从以下OCR文本中抽取信息：\n\n{text}")
-            ])
-
-            if self.llm is not None:
-                # 使用LLM进行结构化抽取
-                structured_llm = self.llm.with_structured_output(schema=list_model)
-                prompt = prompt_template.invoke({"text": text})
-                result = structured_llm.invoke(prompt)
-                items = getattr(result, 'items', [])
+            if self.llm is not None and self._worth_llm(text, model_class):
+                # 使用LLM进行结构化抽取，命中缓存时不调用LLM
+                items, probe = self._cache_lookup(text, model_class)
+                if items is None:
+                    bundle = self._get_bundle(model_class)
+                    result = bundle.structured_llm.invoke(bundle.messages(text))
+                    items = getattr(result, 'items', [])
+                    self._cache_store(probe, items)
             else:
                 # 启发式回退方法
-                items = self._heuristic_extraction(text, extraction_type, model_class)
+                items = self._heuristic_extraction(text, model_class._extraction_type, model_class)
 
-            # 更新置信度
-            for item in items:
-                item.update_confidence()
+            return self._update_confidences(items)
 
-            return items
+        except Exception:
+            logger.exception("信息抽取错误")
+            return []
 
-        except Exception as e:
-            print(f"信息抽取错误: {e}")
+    async def aextract(
+        self,
+        text: str,
+        model_class: Type[BaseExtractionModel]
+    ) -> List[BaseExtractionModel]:
+        """异步抽取信息
+
+        LLM路径使用 ainvoke，等待模型响应时不阻塞事件循环。
+        """
+        try:
+            if not text or not text.strip():
+                return []
+
+            if self.llm is not None and self._worth_llm(text, model_class):
+                items, probe = await self._acache_lookup(text, model_class)
+                if items is None:
+                    bundle = self._get_bundle(model_class)
+                    result = await bundle.structured_llm.ainvoke(bundle.messages(text))
+                    items = getattr(result, 'items', [])
+                    await self._acache_store(probe, items)
+            else:
+                items = self._heuristic_extraction(text, model_class._extraction_type, model_class)
+
+            return self._update_confidences(items)
+
+        except Exception:
+            logger.exception("信息抽取错误")
             return []
+
+    async def aextract_many(
+        self,
+        texts: List[str],
+        model_class: Type[BaseExtractionModel],
+        max_concurrency: int = 8
+    ) -> List[List[BaseExtractionModel]]:
+        """并发抽取多段文本
+
+        通过 abatch 同时发出多个LLM请求，单条失败只影响对应的结果。
+        """
+        results: List[List[BaseExtractionModel]] = [[] for _ in texts]
+        pending = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not pending:
+            return results
+
+        if self.llm is None:
+            for i in pending:
+                results[i] = self.extract(texts[i], model_class)
+            return results
+
+        misses = []
+        probes: Dict[int, _CacheProbe] = {}
+        for i in pending:
+            if not self._worth_llm(texts[i], model_class):
+                results[i] = self._update_confidences(
+                    self._heuristic_extraction(texts[i], model_class._extraction_type, model_class)
+                )
+                continue
+            cached, probes[i] = await self._acache_lookup(texts[i], model_class)
+            if cached is None:
+                misses.append(i)
+            else:
+                results[i] = self._update_confidences(cached)
+        if not misses:
+            return results
+
+        bundle = self._get_bundle(model_class)
+        prompts = [bundle.messages(texts[i]) for i in misses]
+        outputs = await bundle.structured_llm.abatch(
+            prompts,
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True
+        )
+
+        for i, output in zip(misses, outputs):
+            if isinstance(output, Exception):
+                logger.error("信息抽取错误: %s", output, exc_info=output)
+                continue
+            items = getattr(output, 'items', [])
+            await self._acache_store(probes[i], items)
+            results[i] = self._update_confidences(items)
+
+        return results
+
+    async def awarmup(
+        self,
+        model_classes: List[Type[BaseExtractionModel]],
+        invoke: bool = False,
+        timeout: float = 10.0
+    ) -> None:
+        """预热：创建LLM客户端并构建各模型类的结构化输出链
+
+        invoke 为 True 时再发一次短请求，提前建立到LLM服务的连接；
+        该请求失败或超时只记录警告，不影响启动。
+        """
+        if self.llm is None:
+            return
+
+        for model_class in model_classes:
+            self._get_bundle(model_class)
+
+        if invoke and model_classes:
+            bundle = self._get_bundle(model_classes[0])
+            try:
+                await asyncio.wait_for(
+                    bundle.structured_llm.ainvoke(bundle.messages("warmup")),
+                    timeout
+                )
+            except Exception as e:
+                logger.warning("LLM预热请求失败: %r", e)
+
+    def _worth_llm(self, text: str, model_class: Type[BaseExtractionModel]) -> bool:
+        """判断文本是否值得调用LLM
+
+        目前只对人员抽取设门槛：过短或没有任何人员信号的文本交给启发式方法。
+        """
+        if model_class._extraction_type != "person":
+            return True
+        if len(text.strip()) >= _PERSON_MIN_TEXT_LENGTH and _PERSON_SIGNAL_RE.search(text):
+            return True
+        self.skipped_llm += 1
+        return False
+
+    def clear_cache(self) -> None:
+        """清空抽取结果缓存"""
+        if self.cache is not None:
+            self.cache.clear()
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
+        if self.structural_cache is not None:
+            self.structural_cache.clear()
+
+    def _cache_lookup(
+        self,
+        text: str,
+        model_class: Type[BaseExtractionModel]
+    ) -> Tuple[Optional[List[BaseExtractionModel]], _CacheProbe]:
+        """依次查找精确匹配、语义和结构化缓存
+
+        Returns:
+            (抽取结果, 查找上下文)；未命中时抽取结果为None，
+            查找上下文交给 _cache_store 写回，避免重复计算键和向量
+        """
+        extraction_type = model_class._extraction_type
+
+        key = None
+        if self.cache is not None:
+            key = LLMCache.cache_key({
+                "model": getattr(self.llm, "model_name", None),
+                "extraction_type": extraction_type,
+                "system_prompt": self.system_prompts.get(extraction_type, ""),
+                "text_digest": content_digest(text.encode("utf-8")),
+            })
+            hit = self.cache.get(key)
+            if hit is not None:
+                items = list_adapter_for(model_class).validate_json(hit)
+                return items, _CacheProbe(text, model_class, key, None)
+
+        vector = None
+        if self.semantic_cache is not None:
+            vector = self.semantic_cache.encode(text)
+            hit = self.semantic_cache.get(extraction_type, vector)
+            if hit is not None:
+                items = list_adapter_for(model_class).validate_json(hit)
+                return items, _CacheProbe(text, model_class, key, vector)
+
+        probe = _CacheProbe(text, model_class, key, vector)
+        if self.structural_cache is None:
+            return None, probe
+        return self.structural_cache.get(text, model_class), probe
+
+    def _cache_store(self, probe: _CacheProbe, items: List[BaseExtractionModel]) -> None:
+        """缓存LLM的抽取结果"""
+        if self.cache is not None or self.semantic_cache is not None:
+            data = list_adapter_for(probe.model_class).dump_json(items).decode("utf-8")
+            if self.cache is not None:
+                self.cache.set(probe.key, data)
+            if self.semantic_cache is not None:
+                self.semantic_cache.add(probe.model_class._extraction_type, probe.vector, data)
+        if self.structural_cache is not None:
+            self.structural_cache.set(probe.text, probe.model_class, items)
+
+    async def _acache_lookup(
+        self,
+        text: str,
+        model_class: Type[BaseExtractionModel]
+    ) -> Tuple[Optional[List[BaseExtractionModel]], _CacheProbe]:
+        """异步路径的缓存查找，缓存会阻塞时在线程中执行"""
+        if self._blocking_cache:
+            return await asyncio.to_thread(self._cache_lookup, text, model_class)
+        return self._cache_lookup(text, model_class)
+
+    async def _acache_store(self, probe: _CacheProbe, items: List[BaseExtractionModel]) -> None:
+        """异步路径的缓存写回，缓存会阻塞时在线程中执行"""
+        if self._blocking_cache:
+            await asyncio.to_thread(self._cache_store, probe, items)
+        else:
+            self._cache_store(probe, items)
+
+    def _get_bundle(
+        self,
+        model_class: Type[BaseExtractionModel]
+    ) -> _Bundle:
+        """获取模型类对应的列表模型、系统消息和结构化输出LLM
+
+        首次使用某个模型类时构建，之后直接复用缓存。
+        """
+        bundle = self._bundle_cache.get(model_class)
+        if bundle is None:
+            extraction_type = model_class._extraction_type
+
+            list_model = list_model_for(model_class)
+
+            # 系统消息预先构建为固定的消息对象，每次请求直接复用
+            system_message = self._system_message(self.system_prompts.get(extraction_type, ""))
+
+            structured_llm = self.llm.with_structured_output(schema=list_model)
+            bundle = _Bundle(list_model, system_message, _HUMAN_PREFIX, structured_llm)
+            self._bundle_cache[model_class] = bundle
+        return bundle
+
+    def _get_batch_bundle(
+        self,
+        model_class: Type[BaseExtractionModel]
+    ) -> _Bundle:
+        """获取批量模式使用的列表模型、系统消息和结构化输出LLM"""
+        bundle = self._batch_bundle_cache.get(model_class)
+        if bundle is None:
+            extraction_type = model_class._extraction_type
+
+            batch_model = batch_list_model_for(model_class)
+
+            system_message = self._system_message(self._batch_system_prompt(extraction_type))
+
+            structured_llm = self.llm.with_structured_output(schema=batch_model)
+            bundle = _Bundle(batch_model, system_message, _BATCH_HUMAN_PREFIX, structured_llm)
+            self._batch_bundle_cache[model_class] = bundle
+        return bundle
+
+    def _system_message(self, prompt: str) -> SystemMessage:
+        """构建系统消息
+
+        Anthropic兼容端点需要在系统提示块上显式标记 cache_control 才会缓存前缀。
+        """
+        if self.prompt_cache_mode == "anthropic":
+            return SystemMessage(content=[
+                {"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}
+            ])
+        return SystemMessage(content=prompt)
+
+    @staticmethod
+    def _update_confidences(items: List[BaseExtractionModel]) -> List[BaseExtractionModel]:
+        """更新置信度"""
+        for item in items:
+            item.update_confidence()
+        return items
     
+    def extract_batch(
+        self,
+        texts: List[str],
+        model_class: Type[BaseExtractionModel]
+    ) -> List[List[BaseExtractionModel]]:
+        """批量抽取信息
+
+        按token预算将多段文本打包进同一个提示，每个批次只调用一次LLM。
+        打包调用失败时回退到逐条抽取。
+        """
+        results: List[List[BaseExtractionModel]] = [[] for _ in texts]
+        pending = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not pending:
+            return results
+
+        if self.llm is None:
+            for i in pending:
+                results[i] = self.extract(texts[i], model_class)
+            return results
+
+        misses = []
+        probes: Dict[int, _CacheProbe] = {}
+        for i in pending:
+            if not self._worth_llm(texts[i], model_class):
+                results[i] = self._update_confidences(
+                    self._heuristic_extraction(texts[i], model_class._extraction_type, model_class)
+                )
+                continue
+            cached, probes[i] = self._cache_lookup(texts[i], model_class)
+            if cached is None:
+                misses.append(i)
+            else:
+                results[i] = self._update_confidences(cached)
+        pending = misses
+
+        batcher = self._batcher(model_class._extraction_type)
+        for chunk in batcher.batch([texts[i] for i in pending]):
+            indices = [pending[j] for j in chunk]
+            if len(indices) == 1:
+                results[indices[0]] = self.extract(texts[indices[0]], model_class)
+                continue
+
+            try:
+                grouped = self._extract_packed([texts[i] for i in indices], model_class)
+                for i, items in zip(indices, grouped):
+                    self._cache_store(probes[i], items)
+            except Exception:
+                logger.exception("批量信息抽取错误，回退到逐条抽取")
+                grouped = [self.extract(texts[i], model_class) for i in indices]
+
+            for i, items in zip(indices, grouped):
+                results[i] = items
+
+        return results
+
+    async def aextract_batch(
+        self,
+        texts: List[str],
+        model_class: Type[BaseExtractionModel]
+    ) -> List[List[BaseExtractionModel]]:
+        """异步批量抽取信息
+
+        与 extract_batch 相同，按token预算将多段文本打包进同一个提示，
+        每个批次只调用一次LLM，各批次并发发出。打包调用失败时回退到逐条抽取。
+        """
+        results: List[List[BaseExtractionModel]] = [[] for _ in texts]
+        pending = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not pending:
+            return results
+
+        if self.llm is None:
+            for i in pending:
+                results[i] = self.extract(texts[i], model_class)
+            return results
+
+        misses = []
+        probes: Dict[int, _CacheProbe] = {}
+        for i in pending:
+            if not self._worth_llm(texts[i], model_class):
+                results[i] = self._update_confidences(
+                    self._heuristic_extraction(texts[i], model_class._extraction_type, model_class)
+                )
+                continue
+            cached, probes[i] = await self._acache_lookup(texts[i], model_class)
+            if cached is None:
+                misses.append(i)
+            else:
+                results[i] = self._update_confidences(cached)
+        if not misses:
+            return results
+
+        async def run(indices: List[int]) -> None:
+            if len(indices) == 1:
+                results[indices[0]] = await self.aextract(texts[indices[0]], model_class)
+                return
+
+            try:
+                grouped = await self._aextract_packed([texts[i] for i in indices], model_class)
+                for i, items in zip(indices, grouped):
+                    await self._acache_store(probes[i], items)
+            except Exception:
+                logger.exception("批量信息抽取错误，回退到逐条抽取")
+                grouped = await asyncio.gather(*(self.aextract(texts[i], model_class) for i in indices))
+
+            for i, items in zip(indices, grouped):
+                results[i] = items
+
+        batcher = self._batcher(model_class._extraction_type)
+        await asyncio.gather(*(
+            run([misses[j] for j in chunk])
+            for chunk in batcher.batch([texts[i] for i in misses])
+        ))
+        return results
+
+    def _batcher(self, extraction_type: str) -> ChunkBatcher:
+        """按批量系统提示的长度创建分批器"""
+        system_prompt = self._batch_system_prompt(extraction_type)
+        return ChunkBatcher(
+            max_tokens=self.batch_max_tokens,
+            system_prompt_tokens=ChunkBatcher.estimate_tokens(system_prompt),
+            response_buffer_tokens=self.batch_response_tokens,
+        )
+
+    def _batch_system_prompt(self, extraction_type: str) -> str:
+        """批量模式使用的系统提示"""
+        return self.system_prompts.get(extraction_type, "") + _BATCH_INSTRUCTION
+
+    def _extract_packed(
+        self,
+        texts: List[str],
+        model_class: Type[BaseExtractionModel]
+    ) -> List[List[BaseExtractionModel]]:
+        """用一次LLM调用抽取多段文本，按文档编号拆分结果"""
+        bundle = self._get_batch_bundle(model_class)
+        result = bundle.structured_llm.invoke(bundle.messages(_pack_documents(texts)))
+        return self._split_packed(result, texts)
+
+    async def _aextract_packed(
+        self,
+        texts: List[str],
+        model_class: Type[BaseExtractionModel]
+    ) -> List[List[BaseExtractionModel]]:
+        """_extract_packed 的异步版本"""
+        bundle = self._get_batch_bundle(model_class)
+        result = await bundle.structured_llm.ainvoke(bundle.messages(_pack_documents(texts)))
+        return self._split_packed(result, texts)
+
+    def _split_packed(self, result: Any, texts: List[str]) -> List[List[BaseExtractionModel]]:
+        """把打包调用的结果拆回各文档，数量不符时抛出 ValueError"""
+        grouped = list(getattr(result, 'items', []))
+
+        if len(grouped) != len(texts):
+            raise ValueError(f"批量结果数量不匹配: 期望 {len(texts)}，实际 {len(grouped)}")
+
+        return [self._update_confidences(items) for items in grouped]
+
     def supports_model(self, model_class: Type[BaseExtractionModel]) -> bool:
         """检查是否支持指定的模型类型"""
-        extraction_type = model_class.get_extraction_type()
+        extraction_type = model_class._extraction_type
         return extraction_type in self.system_prompts
     
     def _heuristic_extraction(
@@ -152,13 +782,15 @@ class LangChainExtractor(BaseExtractor):
         model_class: Type[BaseExtractionModel]
     ) -> List[BaseExtractionModel]:
         """启发式抽取回退方法"""
-        lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-        
-        if extraction_type == "person":
-            return self._heuristic_person_extraction(lines, model_class)
-        elif extraction_type == "sentiment":
+        if extraction_type == "sentiment":
             return self._heuristic_sentiment_extraction(text, model_class)
-        elif extraction_type == "company_info":
+        if extraction_type == "person":
+            return self._heuristic_person_extraction(text, model_class)
+
+        # 每行只strip一次
+        lines = [s for ln in text.splitlines() if (s := ln.strip())]
+        
+        if extraction_type == "company_info":
             return self._heuristic_company_extraction(lines, model_class)
         elif extraction_type == "product_info":
             return self._heuristic_product_extraction(lines, model_class)
@@ -167,14 +799,17 @@ class LangChainExtractor(BaseExtractor):
         else:
             return []
 
-    def _heuristic_person_extraction(self, lines: List[str], model_class: Type[BaseExtractionModel]) -> List[BaseExtractionModel]:
+    def _heuristic_person_extraction(self, text: str, model_class: Type[BaseExtractionModel]) -> List[BaseExtractionModel]:
         """人员信息启发式抽取"""
-        if not lines:
+        # 分行、去空行和去除行首#一次完成，取到前三行即停止
+        fields = list(islice(
+            (stripped.lstrip("#").strip() for line in text.splitlines() if (stripped := line.strip())),
+            3
+        ))
+        if not fields:
             return []
-        
-        full_name = lines[0].lstrip("#").strip() if len(lines) >= 1 else None
-        job_title = lines[1].lstrip("#").strip() if len(lines) >= 2 else None
-        company_name = lines[2].lstrip("#").strip() if len(lines) >= 3 else None
+
+        full_name, job_title, company_name = fields + [None] * (3 - len(fields))
         
         person = model_class(
             full_name=full_name,
@@ -185,24 +820,9 @@ class LangChainExtractor(BaseExtractor):
 
     def _heuristic_sentiment_extraction(self, text: str, model_class: Type[BaseExtractionModel]) -> List[BaseExtractionModel]:
         """情感分析启发式抽取"""
-        positive_words = ["好", "棒", "优秀", "满意", "喜欢", "推荐", "excellent", "good", "great", "awesome"]
-        negative_words = ["差", "坏", "糟糕", "失望", "不满", "讨厌", "bad", "terrible", "awful", "poor"]
-        
-        text_lower = text.lower()
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
-        
-        if positive_count > negative_count:
-            sentiment = "positive"
-            confidence_score = min(0.8, positive_count * 0.2)
-        elif negative_count > positive_count:
-            sentiment = "negative"
-            confidence_score = min(0.8, negative_count * 0.2)
-        else:
-            sentiment = "neutral"
-            confidence_score = 0.5
-        
-        keywords = [word for word in positive_words + negative_words if word in text_lower]
+        # 单遍扫描找出所有出现过的情感词
+        keywords = self._sentiment_matcher.find(text.lower())
+        sentiment, confidence_score = _score_sentiment(keywords)
         
         sentiment_obj = model_class(
             sentiment=sentiment,
@@ -216,14 +836,14 @@ class LangChainExtractor(BaseExtractor):
         company_info = model_class()
         
         for line in lines:
-            if any(suffix in line.lower() for suffix in ['inc', 'corp', 'llc', 'co', 'ltd', '公司', '有限']):
+            groups = {match.lastgroup for match in _COMPANY_LINE_RE.finditer(line)}
+            if "suffix" in groups:
                 company_info.company_name = line
-            elif any(keyword in line.lower() for keyword in ['tel', '电话', 'phone']):
-                phone_pattern = r'[\d\-\(\)\+\s]+'
-                phone_match = re.search(phone_pattern, line)
+            elif "phone_tag" in groups:
+                phone_match = _PHONE_RE.search(line)
                 if phone_match:
                     company_info.phone = phone_match.group().strip()
-            elif '@' in line:
+            elif "email" in groups:
                 company_info.email = line
         
         return [company_info]
@@ -245,11 +865,11 @@ class LangChainExtractor(BaseExtractor):
         contact_info = model_class()
         
         for line in lines:
-            if '@' in line:
+            groups = {match.lastgroup for match in _CONTACT_LINE_RE.finditer(line)}
+            if "email" in groups:
                 contact_info.email = line
-            elif any(keyword in line.lower() for keyword in ['tel', '电话', 'phone']):
-                phone_pattern = r'[\d\-\(\)\+\s]+'
-                phone_match = re.search(phone_pattern, line)
+            elif "phone_tag" in groups:
+                phone_match = _PHONE_RE.search(line)
                 if phone_match:
                     contact_info.phone = phone_match.group().strip()
             elif not contact_info.name and len(line) > 1:
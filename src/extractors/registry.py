@@ -1,9 +1,12 @@
 """抽取器注册系统"""
 
-from typing import Dict, Type, List, Optional
+import logging
+from typing import Dict, Type, List, Optional, Tuple
 from ..models.base import BaseExtractionModel
 from .base import BaseExtractor
 
+logger = logging.getLogger(__name__)
+
 
 class ExtractorRegistry:
     """抽取器注册中心
@@ -15,6 +18,8 @@ class ExtractorRegistry:
     def __init__(self):
         self._models: Dict[str, Type[BaseExtractionModel]] = {}
         self._extractors: List[BaseExtractor] = []
+        # 抽取类型 -> 抽取器 的索引，注册时维护，按注册顺序取第一个支持的抽取器
+        self._by_type: Dict[str, BaseExtractor] = {}
     
     def register_model(self, model_class: Type[BaseExtractionModel]) -> None:
         """注册模型类型
@@ -22,9 +27,16 @@ class ExtractorRegistry:
         Args:
             model_class: 模型类
         """
-        extraction_type = model_class.get_extraction_type()
+        extraction_type = model_class._extraction_type
         self._models[extraction_type] = model_class
-        print(f"已注册模型类型: {extraction_type} -> {model_class.__name__}")
+
+        # 重新为该类型建立索引
+        self._by_type.pop(extraction_type, None)
+        for extractor in self._extractors:
+            if extractor.supports_model(model_class):
+                self._by_type[extraction_type] = extractor
+                break
+        logger.debug("已注册模型类型: %s -> %s", extraction_type, model_class.__name__)
     
     def register_extractor(self, extractor: BaseExtractor) -> None:
         """注册抽取器
@@ -33,7 +45,35 @@ class ExtractorRegistry:
             extractor: 抽取器实例
         """
         self._extractors.append(extractor)
-        print(f"已注册抽取器: {extractor.__class__.__name__}")
+
+        for extraction_type, model_class in self._models.items():
+            if extraction_type not in self._by_type and extractor.supports_model(model_class):
+                self._by_type[extraction_type] = extractor
+        logger.debug("已注册抽取器: %s", extractor.__class__.__name__)
+
+    def replace_extractor(self, old: BaseExtractor, new: BaseExtractor) -> None:
+        """用新的抽取器替换已注册的抽取器，保持原有的注册顺序
+
+        old 未注册时等同于 register_extractor(new)。
+
+        Args:
+            old: 要替换的抽取器实例
+            new: 新的抽取器实例
+        """
+        index = next((i for i, extractor in enumerate(self._extractors) if extractor is old), None)
+        if index is None:
+            self.register_extractor(new)
+            return
+
+        self._extractors[index] = new
+        # 重建类型索引，原先指向 old 的类型改为指向 new
+        self._by_type.clear()
+        for extraction_type, model_class in self._models.items():
+            for extractor in self._extractors:
+                if extractor.supports_model(model_class):
+                    self._by_type[extraction_type] = extractor
+                    break
+        logger.debug("已替换抽取器: %s", new.__class__.__name__)
     
     def get_model_class(self, extraction_type: str) -> Optional[Type[BaseExtractionModel]]:
         """获取模型类
@@ -55,7 +95,7 @@ class ExtractorRegistry:
         return [
             {
                 "type": extraction_type,
-                "description": model_class.get_description()
+                "description": model_class._description
             }
             for extraction_type, model_class in self._models.items()
         ]
@@ -69,11 +109,32 @@ class ExtractorRegistry:
         Returns:
             抽取器实例，如果找不到则返回None
         """
+        extraction_type = model_class._extraction_type
+        if self._models.get(extraction_type) is model_class:
+            return self._by_type.get(extraction_type)
+
+        # 未注册的模型类回退到线性查找
         for extractor in self._extractors:
             if extractor.supports_model(model_class):
                 return extractor
         return None
     
+    def _resolve(self, extraction_type: str) -> Tuple[Type[BaseExtractionModel], BaseExtractor]:
+        """查找抽取类型对应的模型类和抽取器
+
+        Raises:
+            ValueError: 抽取类型未注册或没有支持它的抽取器
+        """
+        model_class = self.get_model_class(extraction_type)
+        if not model_class:
+            raise ValueError(f"不支持的抽取类型: {extraction_type}")
+        
+        extractor = self.find_extractor(model_class)
+        if not extractor:
+            raise ValueError(f"找不到支持 {extraction_type} 的抽取器")
+
+        return model_class, extractor
+
     def extract(
         self, 
         text: str, 
@@ -88,16 +149,93 @@ class ExtractorRegistry:
         Returns:
             抽取结果列表
         """
-        model_class = self.get_model_class(extraction_type)
-        if not model_class:
-            raise ValueError(f"不支持的抽取类型: {extraction_type}")
-        
-        extractor = self.find_extractor(model_class)
-        if not extractor:
-            raise ValueError(f"找不到支持 {extraction_type} 的抽取器")
-        
+        model_class, extractor = self._resolve(extraction_type)
         return extractor.extract(text, model_class)
 
+    def extract_batch(
+        self,
+        texts: List[str],
+        extraction_type: str
+    ) -> List[List[BaseExtractionModel]]:
+        """批量执行信息抽取
+
+        Args:
+            texts: 要抽取的文本列表
+            extraction_type: 抽取类型
+
+        Returns:
+            与texts一一对应的抽取结果列表
+        """
+        model_class, extractor = self._resolve(extraction_type)
+        return extractor.extract_batch(texts, model_class)
+
+    async def aextract(
+        self,
+        text: str,
+        extraction_type: str
+    ) -> List[BaseExtractionModel]:
+        """异步执行信息抽取
+
+        Args:
+            text: 要抽取的文本
+            extraction_type: 抽取类型
+
+        Returns:
+            抽取结果列表
+        """
+        model_class, extractor = self._resolve(extraction_type)
+        return await extractor.aextract(text, model_class)
+
+    async def aextract_batch(
+        self,
+        texts: List[str],
+        extraction_type: str
+    ) -> List[List[BaseExtractionModel]]:
+        """异步批量执行信息抽取
+
+        Args:
+            texts: 要抽取的文本列表
+            extraction_type: 抽取类型
+
+        Returns:
+            与texts一一对应的抽取结果列表
+        """
+        model_class, extractor = self._resolve(extraction_type)
+        return await extractor.aextract_batch(texts, model_class)
+
+    async def aextract_many(
+        self,
+        texts: List[str],
+        extraction_type: str,
+        max_concurrency: int = 8
+    ) -> List[List[BaseExtractionModel]]:
+        """并发执行多段文本的信息抽取
+
+        Args:
+            texts: 要抽取的文本列表
+            extraction_type: 抽取类型
+            max_concurrency: 同时进行的抽取数上限
+
+        Returns:
+            与texts一一对应的抽取结果列表
+        """
+        model_class, extractor = self._resolve(extraction_type)
+        return await extractor.aextract_many(texts, model_class, max_concurrency)
+
+    async def awarmup(self, invoke: bool = False, timeout: float = 10.0) -> None:
+        """预热所有已注册的抽取器
+
+        Args:
+            invoke: 是否让抽取器发出一次真实请求
+            timeout: 预热请求的超时时间（秒）
+        """
+        grouped: Dict[int, Tuple[BaseExtractor, List[Type[BaseExtractionModel]]]] = {}
+        for extraction_type, extractor in self._by_type.items():
+            grouped.setdefault(id(extractor), (extractor, []))[1].append(self._models[extraction_type])
+
+        for extractor, model_classes in grouped.values():
+            await extractor.awarmup(model_classes, invoke=invoke, timeout=timeout)
+
 
 # 全局注册实例
 registry = ExtractorRegistry()
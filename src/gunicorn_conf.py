@@ -0,0 +1,24 @@
+"""gunicorn 配置
+
+用法：gunicorn -c src/gunicorn_conf.py src.server:app
+或：python -m src.server --gunicorn
+
+需要安装 server 额外依赖（uv sync --extra server），仅支持类Unix系统。
+每个worker是独立的uvicorn事件循环；安装了 uvloop 和 httptools 时
+uvicorn 会自动使用它们（loop/http 均为 "auto"）。
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8001")
+
+# I/O密集型负载，按 2*CPU核数+1 启动worker
+workers = int(os.getenv("WEB_CONCURRENCY", str(2 * multiprocessing.cpu_count() + 1)))
+worker_class = "uvicorn_worker.UvicornWorker"
+worker_connections = 1000
+
+# LLM调用可能较慢，放宽worker超时，避免正常请求被当作卡死而重启worker
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
@@ -1,8 +1,9 @@
 """基础模型定义"""
 
+import inspect
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class BaseExtractionModel(BaseModel, ABC):
@@ -12,7 +13,30 @@ class BaseExtractionModel(BaseModel, ABC):
     这样可以确保一致的接口和行为。
     """
     
+    # 显式固定与Pydantic v2默认值相同的配置，行为不变，只为防止被无意修改：
+    # 抽取结果在创建后会被启发式规则和 update_confidence 赋值，因此不冻结实例，也不做赋值校验；
+    # LLM返回的多余字段被丢弃
+    model_config = ConfigDict(frozen=False, extra="ignore", validate_assignment=False)
+
     confidence: float = Field(default=0.0, description="抽取置信度", ge=0.0, le=1.0)
+
+    # 以下类属性在子类创建时预先计算，避免在热路径上重复调用类方法和遍历字段
+    _extraction_type: ClassVar[Optional[str]] = None
+    _description: ClassVar[Optional[str]] = None
+    # 参与置信度计算的字段（除confidence外的全部字段）
+    _confidence_field_names: ClassVar[Tuple[str, ...]] = ()
+    _confidence_denom: ClassVar[int] = 0
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        if not inspect.isabstract(cls):
+            cls._extraction_type = cls.get_extraction_type()
+            cls._description = cls.get_description()
+        cls._confidence_field_names = tuple(
+            name for name in cls.model_fields if name != "confidence"
+        )
+        cls._confidence_denom = len(cls._confidence_field_names)
     
     @classmethod
     @abstractmethod
@@ -32,16 +56,17 @@ class BaseExtractionModel(BaseModel, ABC):
         默认实现：根据非空字段数量计算置信度
         子类可以重写此方法以实现自定义的置信度计算逻辑
         """
+        total_fields = self._confidence_denom
+        if not total_fields:
+            return 0.0
+
         filled_fields = 0
-        total_fields = len(self.__fields__) - 1  # 减去confidence字段
-        
-        for field_name in self.__fields__:
-            if field_name != 'confidence':
-                value = getattr(self, field_name, None)
-                if value is not None and str(value).strip():
-                    filled_fields += 1
+        for field_name in self._confidence_field_names:
+            value = getattr(self, field_name)
+            if value is not None and (not isinstance(value, str) or value.strip()):
+                filled_fields += 1
         
-        return filled_fields / total_fields if total_fields > 0 else 0.0
+        return filled_fields / total_fields
     
     def update_confidence(self):
         """更新置信度"""
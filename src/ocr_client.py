@@ -1,23 +1,168 @@
 """OCR client to call an existing OCR API service (MinerU)."""
 
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+import httpx
 import requests
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, List, Any, AsyncIterator, Awaitable, BinaryIO, Callable, Deque, Union
 from pathlib import Path
 
+from .extractors.cache import CacheBackend, InMemoryBackend, content_digest, file_digest
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional speedup
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+# Chunk size used when streaming an on-disk upload to the OCR service
+_STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def _loads(content: bytes) -> Any:
+    """Decode a JSON response body, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the OCR service is down.
+
+    The breaker opens once `failure_threshold` failures happen within `window`
+    seconds. While open, calls are rejected without touching the network. After
+    `reset_timeout` seconds a single trial call is let through (half-open): if it
+    succeeds the breaker closes, if it fails the breaker opens again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, window: float = 30.0, reset_timeout: float = 15.0):
+        """
+        Args:
+            failure_threshold: Failures within the window that open the breaker.
+            window: Length of the rolling failure window in seconds.
+            reset_timeout: Seconds to stay open before allowing a trial call.
+        """
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self._failures: Deque[float] = deque()
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """One of "closed", "open" or "half_open"."""
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead; in half-open state only one trial call is allowed."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Close the breaker and forget past failures."""
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("OCR service recovered; circuit closed")
+            self._failures.clear()
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Give up a trial call without judging the service, e.g. when it was cancelled."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the breaker when the threshold is reached."""
+        with self._lock:
+            now = time.monotonic()
+            if self._trial_in_flight:
+                # The trial call failed: stay open for another reset period
+                self._trial_in_flight = False
+                self._opened_at = now
+                return
+
+            self._failures.append(now)
+            while self._failures and now - self._failures[0] > self.window:
+                self._failures.popleft()
+            if self._opened_at is None and len(self._failures) >= self.failure_threshold:
+                self._opened_at = now
+                self._failures.clear()
+                logger.warning(
+                    "OCR service failed %d times within %.0fs; rejecting requests for %.0fs",
+                    self.failure_threshold, self.window, self.reset_timeout,
+                )
+
 
 class OCRClient:
     """Client for a local OCR API service (default: MinerU at 127.0.0.1:8000)."""
 
-    def __init__(self, base_url: str = "http://127.0.0.1:8000"):
+    def __init__(
+        self,
+        base_url: str = "http://127.0.0.1:8000",
+        pool_connections: int = 10,
+        pool_maxsize: int = 50,
+        cache_size: int = 2048,
+        cache_ttl: int = 3600,
+        failure_ttl: float = 5.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
         """
         Initialize the OCR client.
 
         Args:
             base_url: Base URL of the OCR service.
+            pool_connections: Number of connection pools to cache.
+            pool_maxsize: Maximum number of connections kept per pool.
+            cache_size: Number of OCR results cached by image content; 0 disables the cache.
+            cache_ttl: Lifetime of cached OCR results in seconds.
+            failure_ttl: Seconds for which a failed image is not retried; 0 disables this.
+            breaker: Circuit breaker guarding the OCR service; a default one is created if omitted.
         """
         self.base_url = base_url
         self.parse_endpoint = f"{base_url}/file_parse"
 
+        # OCR is deterministic for a given image, so results are cached by content hash.
+        # Any CacheBackend (e.g. RedisBackend) can be assigned to share it across workers.
+        self.cache: Optional[CacheBackend] = InMemoryBackend(maxsize=cache_size) if cache_size > 0 else None
+        self.cache_ttl = cache_ttl
+
+        # Recently failed images are answered with None until failure_ttl expires
+        self.failure_ttl = failure_ttl
+        self._failures = InMemoryBackend(maxsize=1024) if failure_ttl > 0 else None
+        self.breaker = breaker or CircuitBreaker()
+
+        # Persistent session so keep-alive connections are reused across calls
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers["Accept"] = "application/json"
+
     def extract_text_from_image(self, image_path: str) -> Optional[str]:
         """
         Extract text from an image file.
@@ -31,40 +176,156 @@ class OCRClient:
         try:
             # Check file exists
             if not Path(image_path).exists():
-                print(f"Image file does not exist: {image_path}")
+                logger.error("Image file does not exist: %s", image_path)
                 return None
 
-            # Prepare request
             with open(image_path, "rb") as file:
-                files = {"files": file}
-                headers = {"Accept": "application/json"}
-
-                # Send request
-                response = requests.post(
-                    self.parse_endpoint,
-                    headers=headers,
-                    files=files,
-                    timeout=30,
-                )
+                if self.cache is None:
+                    return self._post_file(file)
+                return self._cached("ocr:" + file_digest(file), lambda: self._post_file(file))
 
-                if response.status_code == 200:
-                    result = response.json()
-                    return self._extract_md_content(result)
-                else:
-                    print(
-                        f"OCR API request failed. status: {response.status_code}"
-                    )
-                    print(f"response: {response.text}")
-                    return None
+        except requests.exceptions.RequestException as e:
+            logger.error("Error while requesting OCR API: %s", e)
+            return None
+        except Exception:
+            logger.exception("Unexpected error while processing image")
+            return None
+
+    def extract_text_from_bytes(self, content: bytes, suffix: str = "") -> Optional[str]:
+        """
+        Extract text from an in-memory image without writing it to disk.
+
+        Args:
+            content: Raw image bytes.
+            suffix: File extension (e.g. ".png") used to name the upload so the
+                OCR service can detect the file type.
+
+        Returns:
+            Extracted text content, or None on failure.
+        """
+        try:
+            upload = (f"upload{suffix}", content)
+            if self.cache is None:
+                return self._post_file(upload)
+            return self._cached("ocr:" + content_digest(content), lambda: self._post_file(upload))
 
         except requests.exceptions.RequestException as e:
-            print(f"Error while requesting OCR API: {e}")
+            logger.error("Error while requesting OCR API: %s", e)
             return None
-        except Exception as e:
-            print(f"Unexpected error while processing image: {e}")
+        except Exception:
+            logger.exception("Unexpected error while processing image")
             return None
 
-    def _extract_md_content(self, api_response: Dict[str, Any]) -> Optional[str]:
+    def _cached(self, key: str, fetch: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Return the cached OCR text for key, calling fetch on a miss.
+
+        Failures are only remembered for failure_ttl seconds, so retries of the
+        same image fail fast without hammering the service.
+        """
+        text = self.cache.get(key)
+        if text is not None:
+            return text
+        if self._failures is not None and self._failures.get(key) is not None:
+            return None
+
+        try:
+            text = fetch()
+        except Exception:
+            self._remember_failure(key)
+            raise
+        if text is None:
+            self._remember_failure(key)
+        else:
+            self.cache.set(key, text, self.cache_ttl)
+        return text
+
+    def _remember_failure(self, key: str) -> None:
+        if self._failures is not None:
+            self._failures.set(key, "1", self.failure_ttl)
+
+    def _post_file(self, file: Any) -> Optional[str]:
+        """Send one file to the parse endpoint and read md_content from the reply."""
+        if not self.breaker.allow():
+            logger.debug("OCR circuit is open; skipping request")
+            return None
+
+        # The response body is read lazily
+        try:
+            response = self._session.post(
+                self.parse_endpoint,
+                files={"files": file},
+                timeout=30,
+                stream=True,
+            )
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # An interrupted call says nothing about the service
+            self.breaker.release_trial()
+            raise
+
+        with response:
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+            if response.status_code == 200:
+                return self._read_md_content(response)
+            else:
+                logger.error(
+                    "OCR API request failed. status: %s, response: %s",
+                    response.status_code,
+                    response.text,
+                )
+                return None
+
+    def close(self) -> None:
+        """Close the underlying HTTP session."""
+        self._session.close()
+
+    def _read_md_content(self, response: requests.Response) -> Optional[str]:
+        """
+        Read md_content from a streamed OCR API response.
+
+        With ijson installed the body is parsed incrementally and only the
+        first md_content string is materialized; otherwise the whole body is
+        decoded at once.
+        """
+        if ijson is None:
+            return self._extract_md_content(_loads(response.content))
+
+        response.raw.decode_content = True
+        # Current key at each open container (None for arrays). Keys are tracked
+        # as values rather than dotted prefixes because result keys are file
+        # stems, which may themselves contain dots.
+        keys: List[Optional[str]] = []
+        for event, value in ijson.basic_parse(response.raw):
+            if event in ("start_map", "start_array"):
+                keys.append(None)
+            elif event in ("end_map", "end_array"):
+                keys.pop()
+            elif event == "map_key":
+                keys[-1] = value
+            elif (
+                event == "string"
+                and len(keys) == 3
+                and keys[0] == "results"
+                and keys[1] is not None
+                and keys[2] == "md_content"
+            ):
+                # Read the rest of the body so the connection goes back to the pool
+                # instead of being closed with unread data
+                response.raw.drain_conn()
+                return value
+
+        logger.error("No 'md_content' field found in OCR API response")
+        return None
+
+    @staticmethod
+    def _extract_md_content(api_response: Dict[str, Any]) -> Optional[str]:
         """
         Extract md_content from OCR API JSON response.
 
@@ -77,19 +338,292 @@ class OCRClient:
         try:
             results = api_response.get("results", {})
             if not results:
-                print("No 'results' field in OCR API response")
+                logger.error("No 'results' field in OCR API response")
                 return None
 
             # Return the first 'md_content' found
-            for _, value in results.items():
-                if isinstance(value, dict) and "md_content" in value:
-                    return value["md_content"]
+            md_content = next(
+                (
+                    value["md_content"]
+                    for value in results.values()
+                    if isinstance(value, dict) and "md_content" in value
+                ),
+                None,
+            )
+            if md_content is not None:
+                return md_content
+
+            logger.error("No 'md_content' field found in OCR API response")
+            return None
+
+        except Exception:
+            logger.exception("Error parsing OCR API response")
+            return None
+
+
+class AsyncOCRClient:
+    """Async client for the OCR API service, for use inside an event loop.
+
+    Requests go through one httpx.AsyncClient so a single worker can have many
+    OCR calls in flight. Use OCRClient for synchronous callers such as scripts.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://127.0.0.1:8000",
+        timeout: float = 30.0,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 10,
+        cache_size: int = 2048,
+        cache_ttl: int = 3600,
+        client: Optional[httpx.AsyncClient] = None,
+        failure_ttl: float = 5.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """
+        Initialize the async OCR client.
+
+        Args:
+            base_url: Base URL of the OCR service.
+            timeout: Request timeout in seconds.
+            max_connections: Maximum number of concurrent connections.
+            max_keepalive_connections: Maximum number of idle connections kept open.
+            cache_size: Number of OCR results cached by image content; 0 disables the cache.
+            cache_ttl: Lifetime of cached OCR results in seconds.
+            client: Existing HTTP client to share, e.g. the application-wide one.
+                It is not closed by aclose(); the connection settings above are
+                ignored when it is given.
+            failure_ttl: Seconds for which a failed image is not retried; 0 disables this.
+            breaker: Circuit breaker guarding the OCR service; a default one is created if omitted.
+        """
+        self.base_url = base_url
+        self.parse_endpoint = f"{base_url}/file_parse"
+        self.timeout = timeout
+        self.cache: Optional[CacheBackend] = InMemoryBackend(maxsize=cache_size) if cache_size > 0 else None
+        self.cache_ttl = cache_ttl
+        self.failure_ttl = failure_ttl
+        self._failures = InMemoryBackend(maxsize=1024) if failure_ttl > 0 else None
+        self.breaker = breaker or CircuitBreaker()
+        # One lock per image being OCR'd, so concurrent identical uploads share one request
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
+
+    async def aextract_text_from_image(self, image_path: str) -> Optional[str]:
+        """
+        Extract text from an image file without blocking the event loop.
+
+        Args:
+            image_path: Path to the image file.
+
+        Returns:
+            Extracted text content, or None on failure.
+        """
+        try:
+            path = Path(image_path)
+            if not path.exists():
+                logger.error("Image file does not exist: %s", image_path)
+                return None
+
+            content = await asyncio.to_thread(path.read_bytes)
+            return await self._cached(self._content_key(content), lambda: self._post_file(path.name, content))
+
+        except httpx.HTTPError as e:
+            logger.error("Error while requesting OCR API: %s", e)
+            return None
+        except Exception:
+            logger.exception("Unexpected error while processing image")
+            return None
+
+    async def aextract_text_from_bytes(self, content: bytes, suffix: str = "") -> Optional[str]:
+        """
+        Extract text from an in-memory image, e.g. an uploaded file.
+
+        Args:
+            content: Raw image bytes.
+            suffix: File extension (e.g. ".png") used to name the upload so the
+                OCR service can detect the file type.
+
+        Returns:
+            Extracted text content, or None on failure.
+        """
+        try:
+            return await self._cached(
+                self._content_key(content),
+                lambda: self._post_file(f"upload{suffix}", content),
+            )
+
+        except httpx.HTTPError as e:
+            logger.error("Error while requesting OCR API: %s", e)
+            return None
+        except Exception:
+            logger.exception("Unexpected error while processing image")
+            return None
+
+    async def aextract_text_from_stream(self, file: BinaryIO, filename: str) -> Optional[str]:
+        """
+        Extract text from an open binary file, e.g. the spooled file behind an upload.
+
+        A SpooledTemporaryFile that is still in memory is sent as bytes; handing
+        it to httpx would call fileno() and roll it over to disk. Files on disk
+        are hashed and sent in chunks read off the event loop, so they are never
+        loaded into memory as a whole.
+
+        Args:
+            file: Readable, seekable binary file positioned at the start.
+            filename: File name sent to the OCR service so it can detect the file type.
+
+        Returns:
+            Extracted text content, or None on failure.
+        """
+        try:
+            if getattr(file, "_rolled", True) is False:
+                file.seek(0)
+                content = file.read()
+                return await self._cached(self._content_key(content), lambda: self._post_file(filename, content))
 
-            print("No 'md_content' field found in OCR API response")
+            key = None
+            if self.cache is not None:
+                key = "ocr:" + await asyncio.to_thread(file_digest, file)
+            return await self._cached(key, lambda: self._post_file(filename, file))
+
+        except httpx.HTTPError as e:
+            logger.error("Error while requesting OCR API: %s", e)
+            return None
+        except Exception:
+            logger.exception("Unexpected error while processing image")
             return None
 
-        except Exception as e:
-            print(f"Error parsing OCR API response: {e}")
+    def _content_key(self, content: bytes) -> Optional[str]:
+        """Cache key for an in-memory image, or None when caching is disabled."""
+        if self.cache is None:
             return None
+        return "ocr:" + content_digest(content)
+
+    async def _cached(
+        self,
+        key: Optional[str],
+        fetch: Callable[[], Awaitable[Optional[str]]],
+    ) -> Optional[str]:
+        """
+        Return the cached OCR text for an image, calling fetch on a miss.
+
+        Concurrent misses for the same image wait on a per-image lock, so only
+        the first one reaches the OCR service. Failures are only remembered for
+        failure_ttl seconds, so retries of the same image fail fast.
+        """
+        if key is None:
+            return await fetch()
+
+        text = self.cache.get(key)
+        if text is not None:
+            return text
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                text = self.cache.get(key)
+                if text is not None:
+                    return text
+                if self._failures is not None and self._failures.get(key) is not None:
+                    return None
+
+                try:
+                    text = await fetch()
+                except Exception:
+                    self._remember_failure(key)
+                    raise
+                if text is None:
+                    self._remember_failure(key)
+                else:
+                    self.cache.set(key, text, self.cache_ttl)
+                return text
+        finally:
+            if not lock.locked():
+                self._locks.pop(key, None)
+
+    def _remember_failure(self, key: str) -> None:
+        if self._failures is not None:
+            self._failures.set(key, "1", self.failure_ttl)
+
+    async def _post_file(self, filename: str, content: Union[bytes, BinaryIO]) -> Optional[str]:
+        """Send one file to the parse endpoint and read md_content from the reply."""
+        if not self.breaker.allow():
+            logger.debug("OCR circuit is open; skipping request")
+            return None
+
+        try:
+            if isinstance(content, bytes):
+                request = {"files": {"files": (filename, content)}, "headers": {"Accept": "application/json"}}
+            else:
+                request = await self._multipart_stream(filename, content)
+            response = await self._client.post(self.parse_endpoint, timeout=self.timeout, **request)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancellation says nothing about the service; only free the trial slot
+            self.breaker.release_trial()
+            raise
+
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+        if response.status_code == 200:
+            return OCRClient._extract_md_content(_loads(response.content))
+        else:
+            logger.error(
+                "OCR API request failed. status: %s, response: %s",
+                response.status_code,
+                response.text,
+            )
+            return None
+
+    @staticmethod
+    async def _multipart_stream(filename: str, file: BinaryIO) -> Dict[str, Any]:
+        """
+        Build request arguments that stream a file as multipart/form-data.
+
+        httpx reads file objects synchronously on the event loop, so the body is
+        produced by an async generator that reads each chunk in a worker thread.
+        """
+        boundary = os.urandom(16).hex()
+        quoted_name = filename.replace('"', "%22")
+        head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="files"; filename="{quoted_name}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{boundary}--\r\n".encode()
+
+        # Always start from the beginning, also when retrying after a failed attempt
+        size = await asyncio.to_thread(file.seek, 0, os.SEEK_END)
+        await asyncio.to_thread(file.seek, 0)
+
+        async def body() -> AsyncIterator[bytes]:
+            yield head
+            while chunk := await asyncio.to_thread(file.read, _STREAM_CHUNK_SIZE):
+                yield chunk
+            yield tail
 
+        return {
+            "content": body(),
+            "headers": {
+                "Accept": "application/json",
+                "Content-Type": f"multipart/form-data; boundary={boundary}",
+                "Content-Length": str(len(head) + size + len(tail)),
+            },
+        }
 
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client unless it was passed in."""
+        if self._owns_client:
+            await self._client.aclose()
@@ -20,13 +20,14 @@ class SimpleRegexExtractor(BaseExtractor):
     
     def __init__(self):
         """初始化抽取器"""
-        # 定义各种正则表达式模式
-        self.patterns = {
+        # 定义各种正则表达式模式，初始化时编译一次
+        patterns = {
             "price": r'[¥$￥]\s*\d+(?:\.\d{2})?|\d+(?:\.\d{2})?\s*[元块]',
             "phone": r'1[3-9]\d{9}|0\d{2,3}-?\d{7,8}',
             "email": r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
             "spicy": r'[不无]?辣|微辣|中辣|特辣|变态辣'
         }
+        self.patterns = {name: re.compile(pattern) for name, pattern in patterns.items()}
     
     def extract(
         self, 
@@ -48,7 +49,7 @@ class SimpleRegexExtractor(BaseExtractor):
     
     def _extract_menu_info(self, text: str, model_class: Type[BaseExtractionModel]) -> List[BaseExtractionModel]:
         """抽取菜单信息"""
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        lines = [s for line in text.split('\n') if (s := line.strip())]
         
         # 简单的启发式规则
         dish_name = None
@@ -58,12 +59,12 @@ class SimpleRegexExtractor(BaseExtractor):
         
         for line in lines:
             # 查找价格
-            price_match = re.search(self.patterns["price"], line)
+            price_match = self.patterns["price"].search(line)
             if price_match and not price:
                 price = price_match.group()
             
             # 查找辣度
-            spicy_match = re.search(self.patterns["spicy"], line)
+            spicy_match = self.patterns["spicy"].search(line)
             if spicy_match:
                 spicy_level = spicy_match.group()
             
@@ -1,48 +1,204 @@
 """RESTful API service for OCR-based info extraction powered by LangChain."""
 
-import os
+import argparse
+import asyncio
+import json
 import logging
-import tempfile
+import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import List, Dict, Any
 
+import httpx
 import uvicorn
-from fastapi import FastAPI, File, UploadFile, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, UploadFile, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 
 from .models.base import ExtractionResponse
+from .extractors.cache import content_digest
 from .extractors.registry import registry
 from .config.setup import setup_default_extractors
-from .ocr_client import OCRClient
+from .config.log import setup_logging
+from .ocr_client import AsyncOCRClient
+from .batching import AsyncBatchQueue
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+try:
+    import h2
+except ImportError:  # 可选依赖，安装后启用HTTP/2
+    h2 = None
+
+logger = logging.getLogger(__name__)
+
+# 上传图片的大小上限（字节）
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+
+
+def _check_upload_size(file: UploadFile, limit: int = MAX_UPLOAD_BYTES) -> None:
+    """检查上传文件大小，超过上限时返回413
+
+    上传内容由Starlette暂存在 SpooledTemporaryFile 中（小文件在内存，大文件落盘），
+    这里只读取其大小，不把内容整体读入内存。
+    """
+    size = file.size
+    if size is None:
+        size = file.file.seek(0, os.SEEK_END)
+        file.file.seek(0)
+    if size > limit:
+        raise HTTPException(status_code=413, detail=f"文件过大，最大允许 {limit} 字节")
+
+
+def _check_extraction_type(state: Any, extraction_type: str) -> None:
+    """检查抽取类型是否支持，不支持时返回400"""
+    if extraction_type not in state.supported:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"不支持的抽取类型: {extraction_type}。支持的类型: {state.types_str}"
+        )
+
+
+async def _process(state: Any, file: UploadFile, extraction_type: str) -> ExtractionResponse:
+    """对一个上传文件执行OCR和信息抽取
+
+    文件类型或大小不符合要求时抛出 HTTPException，处理过程中的错误以失败响应返回。
+    """
+    # 验证文件类型
+    if not file.content_type or not file.content_type.startswith("image/"):
+        raise HTTPException(status_code=400, detail="请上传图片文件")
+
+    _check_upload_size(file)
+    suffix = Path(file.filename).suffix if file.filename else ""
+
+    try:
+        # OCR文本抽取
+        # 仍在内存中的上传文件直接以字节发送；已写入磁盘的按块哈希并流式发送，不整体读入内存
+        ocr_text = await state.ocr_client.aextract_text_from_stream(file.file, f"upload{suffix}")
+
+        if ocr_text is None:
+            return ExtractionResponse(
+                success=False,
+                error_message="OCR文本抽取失败，请确保OCR服务正在运行。",
+                extraction_type=extraction_type
+            )
+
+        # 使用注册系统进行信息抽取
+        extracted_items = await state.batch_queue.add_request(ocr_text, extraction_type)
+        
+        # 转换为字典格式
+        extracted_data = [item.model_dump(mode="json") for item in extracted_items]
+
+        return ExtractionResponse(
+            success=True,
+            data=extracted_data,
+            extraction_type=extraction_type,
+            ocr_text=ocr_text
+        )
+
+    except ValueError as e:
+        return ExtractionResponse(
+            success=False,
+            error_message=str(e),
+            extraction_type=extraction_type
+        )
+    except Exception as e:
+        logger.exception("处理错误")
+        return ExtractionResponse(
+            success=False,
+            error_message=f"处理错误: {str(e)}",
+            extraction_type=extraction_type
+        )
+
+
+def _default_response_class() -> type:
+    """选择默认的响应类
 
+    新版FastAPI在声明了 response_model 时直接用Pydantic序列化出JSON字节，
+    并已弃用 ORJSONResponse；旧版本先转成Python对象再用标准库json编码，
+    此时如果安装了orjson就改用 ORJSONResponse。
+    """
+    if orjson is None or hasattr(ORJSONResponse, "__deprecated__"):
+        return JSONResponse
+    return ORJSONResponse
 
 
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """判断 If-None-Match 请求头是否命中给定的ETag"""
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
 
 
 def create_app() -> FastAPI:
     """FastAPI应用工厂函数"""
-    
-    # 初始化默认抽取器和模型
-    setup_default_extractors()
-    
+
+    # 日志经队列由后台线程输出，不阻塞事件循环
+    setup_logging()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # 组件在worker启动时创建，首个请求不再承担初始化开销；
+        # OCR和LLM请求共用一个连接池，保持长连接，避免每次请求重新握手
+        http_client = httpx.AsyncClient(
+            http2=h2 is not None,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            timeout=30.0,
+        )
+        setup_default_extractors(http_async_client=http_client)
+        ocr_client = AsyncOCRClient(client=http_client)
+
+        # 同时到达的抽取请求合并成批次，打包进一次LLM调用
+        batch_queue = AsyncBatchQueue(registry)
+
+        # 预热LLM客户端和结构化输出链；LLM_WARMUP_REQUEST=1 时再发一次真实请求
+        await registry.awarmup(invoke=os.getenv("LLM_WARMUP_REQUEST", "0") == "1")
+        await batch_queue.start()
+
+        # 抽取类型在启动后不再变化，预先生成校验用的集合和 /extraction_types 的响应体
+        supported_types = registry.get_supported_types()
+        app.state.supported = frozenset(t["type"] for t in supported_types)
+        app.state.types_str = ", ".join(sorted(app.state.supported))
+        app.state.types_body = json.dumps(
+            {"supported_types": supported_types}, ensure_ascii=False
+        ).encode("utf-8")
+        app.state.types_etag = f'"{content_digest(app.state.types_body)}"'
+
+        app.state.http = http_client
+        app.state.registry = registry
+        app.state.ocr_client = ocr_client
+        app.state.batch_queue = batch_queue
+        try:
+            yield
+        finally:
+            await batch_queue.stop()
+            await http_client.aclose()
+
     app = FastAPI(
         title="通用OCR信息抽取API",
         description="使用OCR和LangChain从图片中抽取各种类型的信息",
         version="2.0.0",
+        lifespan=lifespan,
+        default_response_class=_default_response_class(),
     )
 
-    # 初始化OCR客户端
-    ocr_client = OCRClient()
-
     @app.get("/extraction_types")
-    async def get_extraction_types():
-        """获取支持的抽取类型列表"""
-        return {
-            "supported_types": registry.get_supported_types()
-        }
+    async def get_extraction_types(request: Request):
+        """获取支持的抽取类型列表
+
+        响应体在启动时生成，客户端携带匹配的 If-None-Match 时返回304。
+        """
+        state = request.app.state
+        headers = {"ETag": state.types_etag}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, state.types_etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=state.types_body, media_type="application/json", headers=headers)
 
     @app.post("/extract", response_model=ExtractionResponse)
     async def extract_info(
+        request: Request,
         file: UploadFile = File(...),
         extraction_type: str = Query(
             default="person",
@@ -50,74 +206,62 @@ def create_app() -> FastAPI:
         )
     ):
         """从上传的图片文件中抽取指定类型的信息"""
-        # 验证文件类型
-        if not file.content_type or not file.content_type.startswith("image/"):
-            raise HTTPException(status_code=400, detail="请上传图片文件")
+        state = request.app.state
 
         # 检查抽取类型是否支持
-        if not registry.get_model_class(extraction_type):
-            supported_types = [t["type"] for t in registry.get_supported_types()]
-            raise HTTPException(
-                status_code=400, 
-                detail=f"不支持的抽取类型: {extraction_type}。支持的类型: {', '.join(supported_types)}"
-            )
+        _check_extraction_type(state, extraction_type)
 
-        # 保存到临时文件
-        with tempfile.NamedTemporaryFile(
-            delete=False, suffix=Path(file.filename).suffix
-        ) as temp_file:
-            try:
-                # 写入文件内容
-                content = await file.read()
-                temp_file.write(content)
-                temp_file.flush()
-
-                # OCR文本抽取
-                ocr_text = ocr_client.extract_text_from_image(temp_file.name)
-
-                if ocr_text is None:
-                    return ExtractionResponse(
-                        success=False,
-                        error_message="OCR文本抽取失败，请确保OCR服务正在运行。",
-                        extraction_type=extraction_type
-                    )
-
-                # 使用注册系统进行信息抽取
-                extracted_items = registry.extract(ocr_text, extraction_type)
-                
-                # 转换为字典格式
-                extracted_data = [item.model_dump() for item in extracted_items]
-
-                return ExtractionResponse(
-                    success=True,
-                    data=extracted_data,
-                    extraction_type=extraction_type,
-                    ocr_text=ocr_text
-                )
+        return await _process(state, file, extraction_type)
 
-            except ValueError as e:
-                return ExtractionResponse(
+    @app.post("/extract_batch", response_model=List[ExtractionResponse])
+    async def extract_batch(
+        request: Request,
+        files: List[UploadFile] = File(...),
+        extraction_type: str = Query(
+            default="person",
+            description="抽取类型"
+        )
+    ):
+        """从多张图片中并发抽取指定类型的信息
+
+        结果与上传顺序一一对应，单个文件失败只影响对应的结果。
+        内容相同的图片共用一次OCR调用，各文件的抽取请求进入同一个批处理队列。
+        """
+        state = request.app.state
+        _check_extraction_type(state, extraction_type)
+
+        # 限制同时处理的文件数，避免一次上传压垮OCR和LLM服务
+        semaphore = asyncio.Semaphore(min(16, len(files)))
+
+        async def run(file: UploadFile) -> ExtractionResponse:
+            async with semaphore:
+                return await _process(state, file, extraction_type)
+
+        results = await asyncio.gather(*(run(file) for file in files), return_exceptions=True)
+
+        responses = []
+        for result in results:
+            if isinstance(result, HTTPException):
+                result = ExtractionResponse(
                     success=False,
-                    error_message=str(e),
+                    error_message=result.detail,
                     extraction_type=extraction_type
                 )
-            except Exception as e:
-                return ExtractionResponse(
+            elif isinstance(result, BaseException):
+                logger.error("处理错误", exc_info=result)
+                result = ExtractionResponse(
                     success=False,
-                    error_message=f"处理错误: {str(e)}",
+                    error_message=f"处理错误: {str(result)}",
                     extraction_type=extraction_type
                 )
-            finally:
-                try:
-                    os.unlink(temp_file.name)
-                except Exception:
-                    pass
+            responses.append(result)
+        return responses
 
     # 保持向后兼容性的旧接口
     @app.post("/extract_person", response_model=ExtractionResponse)
-    async def extract_person_info_legacy(file: UploadFile = File(...)):
+    async def extract_person_info_legacy(request: Request, file: UploadFile = File(...)):
         """提取人员信息（向后兼容接口）"""
-        return await extract_info(file, "person")
+        return await extract_info(request, file, "person")
 
     return app
 
@@ -128,10 +272,38 @@ app = create_app()
 
 def main():
     """使用uvicorn运行API服务器"""
-    logging.info("启动通用OCR信息抽取API...")
-    logging.info("API文档: http://0.0.0.0:8001/docs")
-    
-    uvicorn.run(app, host="0.0.0.0", port=8001, log_level="info")
+    parser = argparse.ArgumentParser(description="通用OCR信息抽取API服务")
+    parser.add_argument("--host", default="0.0.0.0", help="监听地址")
+    parser.add_argument("--port", type=int, default=8001, help="监听端口")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=2 * (os.cpu_count() or 1) + 1,
+        help="worker进程数，默认 2*CPU核数+1"
+    )
+    parser.add_argument(
+        "--gunicorn",
+        action="store_true",
+        help="由gunicorn管理uvicorn worker（需要 server 额外依赖，仅限类Unix系统）"
+    )
+    args = parser.parse_args()
+
+    logger.info("启动通用OCR信息抽取API（%d 个worker）...", args.workers)
+    logger.info("API文档: http://%s:%d/docs", args.host, args.port)
+
+    if args.gunicorn:
+        # 用gunicorn进程替换当前进程，其余配置见 gunicorn_conf.py
+        config_path = str(Path(__file__).with_name("gunicorn_conf.py"))
+        os.execvp("gunicorn", [
+            "gunicorn",
+            "-c", config_path,
+            "--bind", f"{args.host}:{args.port}",
+            "--workers", str(args.workers),
+            "src.server:app",
+        ])
+
+    # 多worker模式下uvicorn需要以导入字符串的形式加载应用
+    uvicorn.run("src.server:app", host=args.host, port=args.port, workers=args.workers, log_level="info")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,30 @@
+"""测试共用的fixture"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src import ocr_client
+from src.extractors import cache
+
+
+class FakeClock:
+    """可手动推进的单调时钟"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """替换熔断器和缓存后端使用的时钟，不影响事件循环自身的计时"""
+    fake = FakeClock()
+    monkeypatch.setattr(ocr_client, "time", SimpleNamespace(monotonic=fake))
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=fake))
+    return fake
@@ -0,0 +1,123 @@
+"""AsyncBatchQueue 合并、异常分发和停止行为的测试"""
+
+import asyncio
+
+from src.batching import AsyncBatchQueue
+
+
+class _FakeRegistry:
+    """记录调用的注册表替身"""
+
+    def __init__(self, error=None, delay=0.0):
+        self.batch_calls = []
+        self.single_calls = []
+        self.error = error
+        self.delay = delay
+
+    async def aextract_batch(self, texts, extraction_type):
+        self.batch_calls.append((list(texts), extraction_type))
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [[f"{extraction_type}:{text}"] for text in texts]
+
+    async def aextract(self, text, extraction_type):
+        self.single_calls.append((text, extraction_type))
+        return [f"{extraction_type}:{text}"]
+
+
+def test_concurrent_requests_merge_per_type():
+    registry = _FakeRegistry()
+    queue = AsyncBatchQueue(registry)
+
+    async def run():
+        await queue.start()
+        results = await asyncio.gather(
+            queue.add_request("a", "person"),
+            queue.add_request("b", "company"),
+            queue.add_request("c", "person"),
+        )
+        await queue.stop()
+        return results
+
+    results = asyncio.run(run())
+    assert results == [["person:a"], ["company:b"], ["person:c"]]
+    assert {t: texts for texts, t in registry.batch_calls} == {"person": ["a", "c"], "company": ["b"]}
+    assert len(registry.batch_calls) == 2
+    assert registry.single_calls == []
+
+
+def test_batch_respects_max_batch_size():
+    registry = _FakeRegistry()
+    queue = AsyncBatchQueue(registry, max_batch_size=2)
+
+    async def run():
+        await queue.start()
+        await asyncio.gather(*(queue.add_request(str(i), "person") for i in range(5)))
+        await queue.stop()
+
+    asyncio.run(run())
+    assert [len(texts) for texts, _ in registry.batch_calls] == [2, 2, 1]
+
+
+def test_batch_error_reaches_every_request():
+    registry = _FakeRegistry(error=ValueError("boom"))
+    queue = AsyncBatchQueue(registry)
+
+    async def run():
+        await queue.start()
+        results = await asyncio.gather(
+            queue.add_request("a", "person"),
+            queue.add_request("b", "person"),
+            return_exceptions=True,
+        )
+        await queue.stop()
+        return results
+
+    results = asyncio.run(run())
+    assert [type(r) for r in results] == [ValueError, ValueError]
+    assert len(registry.batch_calls) == 1
+
+
+def test_unstarted_queue_calls_registry_directly():
+    registry = _FakeRegistry()
+    queue = AsyncBatchQueue(registry)
+
+    assert asyncio.run(queue.add_request("a", "person")) == ["person:a"]
+    assert registry.single_calls == [("a", "person")]
+    assert registry.batch_calls == []
+
+
+def test_stop_fails_collected_requests():
+    registry = _FakeRegistry()
+    # 等待时间足够长，请求停留在收集中的批次里
+    queue = AsyncBatchQueue(registry, max_wait_time=60.0)
+
+    async def run():
+        await queue.start()
+        pending = asyncio.gather(
+            queue.add_request("a", "person"),
+            queue.add_request("b", "person"),
+            return_exceptions=True,
+        )
+        await asyncio.sleep(0.01)
+        await queue.stop()
+        return await asyncio.wait_for(pending, 1)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert registry.batch_calls == []
+
+
+def test_stop_waits_for_running_batch():
+    registry = _FakeRegistry(delay=0.05)
+    queue = AsyncBatchQueue(registry)
+
+    async def run():
+        await queue.start()
+        task = asyncio.create_task(queue.add_request("a", "person"))
+        await asyncio.sleep(0.01)
+        await queue.stop()
+        return await asyncio.wait_for(task, 1)
+
+    assert asyncio.run(run()) == ["person:a"]
@@ -0,0 +1,68 @@
+"""缓存后端和LLM结果缓存的测试"""
+
+from src.extractors.cache import InMemoryBackend, LLMCache
+
+
+def test_in_memory_backend_expires_after_ttl(clock):
+    backend = InMemoryBackend()
+    backend.set("k", "v", ttl_seconds=10)
+
+    clock.advance(9.9)
+    assert backend.get("k") == "v"
+    clock.advance(0.1)
+    assert backend.get("k") is None
+
+
+def test_in_memory_backend_without_ttl_never_expires(clock):
+    backend = InMemoryBackend()
+    backend.set("k", "v")
+
+    clock.advance(10 ** 9)
+    assert backend.get("k") == "v"
+
+
+def test_in_memory_backend_evicts_least_recently_used():
+    backend = InMemoryBackend(maxsize=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    backend.get("a")
+    backend.set("c", "3")
+
+    assert backend.get("a") == "1"
+    assert backend.get("b") is None
+    assert backend.get("c") == "3"
+
+
+def test_llm_cache_key_ignores_payload_order():
+    first = LLMCache.cache_key({"model": "m", "text_digest": "x"})
+    second = LLMCache.cache_key({"text_digest": "x", "model": "m"})
+
+    assert first == second
+    assert first != LLMCache.cache_key({"model": "m", "text_digest": "y"})
+
+
+def test_llm_cache_round_trip_and_ttl(clock):
+    llm_cache = LLMCache(InMemoryBackend(), ttl_seconds=60)
+    llm_cache.set("k", '[{"full_name": "Ada"}]')
+
+    assert llm_cache.get("k") == '[{"full_name": "Ada"}]'
+    clock.advance(60)
+    assert llm_cache.get("k") is None
+
+
+class _BrokenBackend:
+    def get(self, key):
+        raise ConnectionError("down")
+
+    def set(self, key, value, ttl_seconds=None):
+        raise ConnectionError("down")
+
+    def clear(self):
+        pass
+
+
+def test_llm_cache_treats_backend_errors_as_misses():
+    llm_cache = LLMCache(_BrokenBackend())
+
+    llm_cache.set("k", "v")
+    assert llm_cache.get("k") is None
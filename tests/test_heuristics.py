@@ -0,0 +1,56 @@
+"""启发式抽取回退方法的回归测试"""
+
+import time
+
+import pytest
+
+from src.extractors.langchain_extractor import LangChainExtractor
+from src.models import CompanyInfo, ContactInfo, Person
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    extractor = LangChainExtractor()
+    # 只测试启发式路径，不论环境中是否配置了LLM
+    extractor.llm = None
+    return extractor
+
+
+@pytest.mark.parametrize("text, company_name", [
+    ("Intel Corp", "Intel Corp"),
+    ("Hotel California LLC", "Hotel California LLC"),
+    ("Phone: 555-1234 Acme Inc", "Phone: 555-1234 Acme Inc"),
+])
+def test_company_suffix_takes_priority(extractor, text, company_name):
+    [info] = extractor._heuristic_extraction(text, "company_info", CompanyInfo)
+    assert info.company_name == company_name
+
+
+def test_company_phone_tag_requires_word_boundary(extractor):
+    [info] = extractor._heuristic_extraction("Tel: 555-1234\nIntel 12345", "company_info", CompanyInfo)
+    assert info.phone == "555-1234"
+
+
+def test_contact_email_takes_priority_over_phone_tag(extractor):
+    [info] = extractor._heuristic_extraction("Ada Lovelace\ntel john@x.com", "contact_info", ContactInfo)
+    assert info.name == "Ada Lovelace"
+    assert info.email == "tel john@x.com"
+    assert info.phone is None
+
+
+@pytest.mark.parametrize("text, fields", [
+    ("###\nAda Lovelace\nEngineer", ("", "Ada Lovelace", "Engineer")),
+    ("# Ada Lovelace\rEngineer\r\n\r\n## Acme Inc  ", ("Ada Lovelace", "Engineer", "Acme Inc")),
+])
+def test_person_lines_match_splitlines(extractor, text, fields):
+    [person] = extractor._heuristic_extraction(text, "person", Person)
+    assert (person.full_name, person.job_title, person.company_name) == fields
+
+
+def test_person_long_whitespace_line(extractor):
+    # 回溯的正则在这里需要数秒，逐行 strip 是线性的
+    text = "a" + " " * 16000 + "b"
+    start = time.perf_counter()
+    [person] = extractor._heuristic_extraction(text, "person", Person)
+    assert time.perf_counter() - start < 0.5
+    assert person.full_name == text
@@ -0,0 +1,216 @@
+"""OCR客户端熔断器、失败缓存和并发去重的测试"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.ocr_client import AsyncOCRClient, CircuitBreaker
+
+
+def _open(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_breaker_opens_after_threshold_within_window(clock):
+    breaker = CircuitBreaker(failure_threshold=3, window=30.0, reset_timeout=15.0)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_breaker_forgets_failures_outside_window(clock):
+    breaker = CircuitBreaker(failure_threshold=3, window=30.0)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.advance(31)
+    breaker.record_failure()
+
+    assert breaker.state == "closed"
+
+
+def test_breaker_half_open_allows_single_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=15.0)
+    _open(breaker)
+
+    clock.advance(14.9)
+    assert not breaker.allow()
+    clock.advance(0.1)
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    # 试探请求进行中，其余请求仍被拒绝
+    assert not breaker.allow()
+
+
+def test_breaker_trial_success_closes(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=15.0)
+    _open(breaker)
+    clock.advance(15)
+    assert breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_breaker_trial_failure_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=15.0)
+    _open(breaker)
+    clock.advance(15)
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.advance(14.9)
+    assert not breaker.allow()
+    clock.advance(0.1)
+    assert breaker.allow()
+
+
+def test_breaker_release_trial_frees_slot(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=15.0)
+    _open(breaker)
+    clock.advance(15)
+    assert breaker.allow()
+
+    breaker.release_trial()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+
+
+def _client(handler, **kwargs) -> AsyncOCRClient:
+    transport = httpx.MockTransport(handler)
+    return AsyncOCRClient("http://ocr", client=httpx.AsyncClient(transport=transport), **kwargs)
+
+
+def _ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"results": {"img": {"md_content": "text"}}})
+
+
+def test_open_breaker_skips_network():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return _ok(request)
+
+    breaker = CircuitBreaker(failure_threshold=1)
+    breaker.record_failure()
+    ocr = _client(handler, breaker=breaker)
+
+    assert asyncio.run(ocr.aextract_text_from_bytes(b"img")) is None
+    assert requests == []
+
+
+def test_server_errors_open_breaker_and_client_errors_do_not():
+    statuses = iter([400, 500, 503])
+
+    def handler(request):
+        return httpx.Response(next(statuses), text="error")
+
+    breaker = CircuitBreaker(failure_threshold=2)
+    ocr = _client(handler, breaker=breaker, failure_ttl=0)
+
+    async def run():
+        for i in range(3):
+            await ocr.aextract_text_from_bytes(b"img%d" % i)
+
+    asyncio.run(run())
+    assert breaker.state == "open"
+    assert len(breaker._failures) == 0
+
+
+def test_cancelled_request_is_not_a_failure(clock):
+    async def handler(request):
+        await asyncio.sleep(10)
+        return _ok(request)
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=15.0)
+    ocr = _client(handler, breaker=breaker, failure_ttl=0)
+
+    async def run():
+        task = asyncio.create_task(ocr.aextract_text_from_bytes(b"img"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert breaker.state == "closed"
+
+    # 半开状态下被取消的试探请求只释放名额
+    breaker.record_failure()
+    clock.advance(15)
+    asyncio.run(run())
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+
+
+def test_failed_image_is_not_retried_within_failure_ttl(clock):
+    ocr = AsyncOCRClient("http://ocr", failure_ttl=5.0)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return None
+
+    async def run():
+        key = ocr._content_key(b"img")
+        assert await ocr._cached(key, fetch) is None
+        assert await ocr._cached(key, fetch) is None
+        assert len(calls) == 1
+
+        clock.advance(5)
+        assert await ocr._cached(key, fetch) is None
+        assert len(calls) == 2
+        await ocr.aclose()
+
+    asyncio.run(run())
+
+
+def test_fetch_exception_is_remembered_and_reraised(clock):
+    ocr = AsyncOCRClient("http://ocr", failure_ttl=5.0)
+
+    async def fetch():
+        raise httpx.ConnectError("refused")
+
+    async def run():
+        key = ocr._content_key(b"img")
+        with pytest.raises(httpx.ConnectError):
+            await ocr._cached(key, fetch)
+        assert await ocr._cached(key, fetch) is None
+        await ocr.aclose()
+
+    asyncio.run(run())
+
+
+def test_concurrent_identical_images_share_one_request(monkeypatch):
+    ocr = AsyncOCRClient("http://ocr")
+    calls = []
+
+    async def post_file(filename, content):
+        calls.append(content)
+        await asyncio.sleep(0.01)
+        return "text"
+
+    monkeypatch.setattr(ocr, "_post_file", post_file)
+
+    async def run():
+        results = await asyncio.gather(*(ocr.aextract_text_from_bytes(b"same") for _ in range(10)))
+        other = await ocr.aextract_text_from_bytes(b"other")
+        await ocr.aclose()
+        return results, other
+
+    results, other = asyncio.run(run())
+    assert results == ["text"] * 10
+    assert other == "text"
+    assert calls == [b"same", b"other"]
+    assert ocr._locks == {}